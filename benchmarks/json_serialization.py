@@ -0,0 +1,78 @@
+"""Microbenchmark de serialização do envelope de resposta.
+
+Compara a vazão de serialização de um histórico com N transações (padrão: 10 mil)
+entre o caminho anterior (strftime por campo + encoder padrão do Flask) e os
+providers de config.json_provider (stdlib e orjson, quando instalado).
+
+Exemplo:
+    python benchmarks/json_serialization.py --rows 10000 --repeat 20
+"""
+from datetime import datetime, timedelta
+from decimal import Decimal
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from config.json_provider import MoneyJSONProvider, OrjsonJSONProvider, orjson
+
+def build_rows(count: int) -> list[dict]:
+    start = datetime(2023, 1, 1)
+    return [{
+        'id': i,
+        'type': 'PIX' if i % 3 else 'CREDITO',
+        'description': 'TRANSFERENCIA',
+        'amount': Decimal(i % 10000) / 100,
+        'paid_for_received_from': f'user_{i % 500}',
+        'datetime': start + timedelta(seconds=i)
+    } for i in range(count)]
+
+def legacy_rows(rows: list[dict]) -> list[dict]:
+    return [{
+        **row,
+        'amount': float(row['amount']),
+        'datetime': datetime.strftime(row['datetime'], "%Y-%m-%d %H:%M:%S")
+    } for row in rows]
+
+def envelope(data) -> dict:
+    return {'status': 'success', 'code': 200, 'message': 'ok', 'error': None, 'data': data, 'next_cursor': None}
+
+def measure(name: str, provider_class, rows: list[dict], repeat: int, prepare=None) -> None:
+    app = Flask(__name__)
+    app.json = provider_class(app)
+    timings = []
+
+    with app.app_context():
+        for _ in range(repeat):
+            started = time.perf_counter()
+            data = prepare(rows) if prepare else rows
+            size = len(app.json.response(envelope(data)).get_data())
+            timings.append(time.perf_counter() - started)
+
+    best = min(timings)
+    print(f'{name:<28} {best * 1000:8.1f} ms  {len(rows) / best:12,.0f} linhas/s  {size / 1024:8.0f} KiB')
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    rows = build_rows(args.rows)
+    print(f'{args.rows} linhas, melhor de {args.repeat} execuções')
+    measure('flask + strftime (anterior)', DefaultJSONProvider, rows, args.repeat, prepare=legacy_rows)
+    measure('MoneyJSONProvider (stdlib)', MoneyJSONProvider, rows, args.repeat)
+
+    if orjson is not None:
+        measure('OrjsonJSONProvider', OrjsonJSONProvider, rows, args.repeat)
+    else:
+        print('orjson não instalado: OrjsonJSONProvider ignorado.')
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
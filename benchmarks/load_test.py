@@ -0,0 +1,313 @@
+"""Teste de carga da API contra um servidor em execução.
+
+Usa os usuários criados por benchmarks/seed_database.py (mesmos --prefix,
+--users e --password) e dispara, para cada cenário e nível de concorrência,
+requisições contínuas durante --duration segundos. Cada worker mantém a
+própria conexão HTTP (keep-alive). Ao final, imprime vazão, p50 e p99 por
+cenário; com --baseline, compara com uma execução anterior salva via
+--save-baseline e termina com código 1 se houver regressão além de
+--tolerance. Deve ser executado contra um ambiente local, nunca contra produção.
+
+Exemplo:
+    python benchmarks/load_test.py --base-url http://127.0.0.1:8000 --users 10000 \\
+        --concurrency 16,64 --duration 30 --save-baseline benchmarks/baseline.json
+    python benchmarks/load_test.py --base-url http://127.0.0.1:8000 --users 10000 \\
+        --concurrency 16,64 --duration 30 --baseline benchmarks/baseline.json
+"""
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+import argparse
+import base64
+import http.client
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+    parser.add_argument('--prefix', default='bench')
+    parser.add_argument('--password', default='benchmark')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--pixkeys-per-user', type=int, default=1)
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS))
+    parser.add_argument('--concurrency', default='1,16,64')
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--warmup', type=float, default=2.0)
+    parser.add_argument('--sessions', type=int, default=200, help='usuários autenticados usados pelos cenários')
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--output', help='grava os resultados desta execução em JSON')
+    parser.add_argument('--save-baseline', help='grava os resultados como baseline')
+    parser.add_argument('--baseline', help='compara com um baseline salvo anteriormente')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='regressão aceita (0.2 = 20%%)')
+    return parser.parse_args()
+
+class Client:
+    def __init__(self, base_url: str, timeout: float) -> None:
+        url = urlsplit(base_url)
+        connection_class = http.client.HTTPSConnection if url.scheme == 'https' else http.client.HTTPConnection
+        self._connection = connection_class(url.hostname, url.port, timeout=timeout)
+        self._prefix = url.path.rstrip('/')
+
+    def request(self, method: str, path: str, token: str | None = None, body: dict | None = None) -> tuple[int, bytes]:
+        headers = {'Accept-Encoding': 'identity'}
+
+        if token:
+            headers['Authorization'] = token
+
+        if body is not None:
+            headers['Content-Type'] = 'application/json'
+            body = json.dumps(body)
+
+        try:
+            self._connection.request(method, self._prefix + path, body=body, headers=headers)
+            response = self._connection.getresponse()
+            return response.status, response.read()
+        except (OSError, http.client.HTTPException):
+            self._connection.close()
+            raise
+
+    def close(self) -> None:
+        self._connection.close()
+
+class Context:
+    def __init__(self, args, tokens: list[tuple[int, str]], transaction_type: int) -> None:
+        self.args = args
+        self.tokens = tokens
+        self.transaction_type = transaction_type
+        self.rng = random.Random()
+
+    def username(self) -> str:
+        return f'{self.args.prefix}_{self.rng.randrange(self.args.users)}'
+
+    def session(self) -> tuple[int, str]:
+        return self.rng.choice(self.tokens)
+
+def login(client: Client, context: Context) -> int:
+    return client.request('POST', '/auth/login', body={'username': context.username(), 'password': context.args.password})[0]
+
+def send_transaction(client: Client, context: Context) -> int:
+    (_, token), (receiver_id, _) = context.rng.sample(context.tokens, 2)
+    body = {'receiver': receiver_id, 'amount': round(context.rng.uniform(0.01, 1), 2), 'transaction_type': context.transaction_type}
+    return client.request('POST', '/transaction/send_transaction', token, body)[0]
+
+def get_current_balance(client: Client, context: Context) -> int:
+    return client.request('GET', '/transaction/get_current_balance', context.session()[1])[0]
+
+def get_balance(client: Client, context: Context) -> int:
+    return client.request('GET', '/transaction/get_balance?limit=50', context.session()[1])[0]
+
+def get_transactions(client: Client, context: Context) -> int:
+    return client.request('GET', '/transaction/get_transactions?limit=50', context.session()[1])[0]
+
+def search_pixkey(client: Client, context: Context) -> int:
+    user = context.rng.randrange(context.args.users)
+    key = f'{context.args.prefix}.{user}.{context.rng.randrange(max(context.args.pixkeys_per_user, 1))}@bench.local'
+    return client.request('GET', '/pixkey/search_pixkey', context.session()[1], {'pixkey': key})[0]
+
+def get_credit_cards(client: Client, context: Context) -> int:
+    return client.request('GET', '/credit_card/get_credit_cards', context.session()[1])[0]
+
+def export(client: Client, context: Context) -> int:
+    return client.request('GET', '/transaction/export?format=ndjson', context.session()[1])[0]
+
+SCENARIOS = {
+    'login': login,
+    'send_transaction': send_transaction,
+    'get_current_balance': get_current_balance,
+    'get_balance': get_balance,
+    'get_transactions': get_transactions,
+    'search_pixkey': search_pixkey,
+    'get_credit_cards': get_credit_cards,
+    'export': export
+}
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+def run_scenario(name: str, concurrency: int, context: Context) -> dict:
+    args = context.args
+    operation = SCENARIOS[name]
+    lock = threading.Lock()
+    latencies = []
+    errors = {}
+    measure_from = time.perf_counter() + args.warmup
+    stop_at = measure_from + args.duration
+
+    def worker(_) -> None:
+        client = Client(args.base_url, args.timeout)
+        local_latencies = []
+        local_errors = {}
+
+        try:
+            while (started := time.perf_counter()) < stop_at:
+                try:
+                    status = operation(client, context)
+                except (OSError, http.client.HTTPException) as error:
+                    status = type(error).__name__
+
+                finished = time.perf_counter()
+
+                if started < measure_from:
+                    continue
+
+                local_latencies.append(finished - started)
+
+                if not isinstance(status, int) or status >= 400:
+                    local_errors[str(status)] = local_errors.get(str(status), 0) + 1
+        finally:
+            client.close()
+
+        with lock:
+            latencies.extend(local_latencies)
+
+            for status, count in local_errors.items():
+                errors[status] = errors.get(status, 0) + count
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(worker, range(concurrency)))
+
+    latencies.sort()
+    requests = len(latencies)
+
+    return {
+        'scenario': name,
+        'concurrency': concurrency,
+        'requests': requests,
+        'errors': sum(errors.values()),
+        'error_codes': errors,
+        'throughput': requests / args.duration,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000
+    }
+
+def authenticate(args) -> list[tuple[int, str]]:
+    client = Client(args.base_url, args.timeout)
+    tokens = []
+
+    try:
+        for i in random.sample(range(args.users), min(args.sessions, args.users)):
+            status, body = client.request('POST', '/auth/login', body={'username': f'{args.prefix}_{i}', 'password': args.password})
+
+            if status == 429:
+                raise SystemExit('Login limitado (429). Inicie o servidor com LOGIN_IP_PER_MINUTE=0 e LOGIN_USER_PER_MINUTE=0.')
+
+            if status != 200:
+                raise SystemExit(f'Falha no login de {args.prefix}_{i} ({status}). Rode benchmarks/seed_database.py antes.')
+
+            token = json.loads(body)['data']['token']
+            tokens.append((token_user_id(token), token))
+    finally:
+        client.close()
+
+    return tokens
+
+def token_user_id(token: str) -> int:
+    # O id vem do payload do JWT; a assinatura é verificada pelo servidor.
+    payload = token.split('.')[1]
+    return json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))['user']['id']
+
+def find_transaction_type(args, token: str) -> int:
+    client = Client(args.base_url, args.timeout)
+
+    try:
+        status, body = client.request('GET', '/transaction/get_transaction_types', token)
+    finally:
+        client.close()
+
+    for transaction_type in json.loads(body)['data'] if status == 200 else []:
+        if transaction_type['description'] == 'BENCHMARK':
+            return transaction_type['id']
+
+    raise SystemExit('Tipo de transação BENCHMARK não encontrado. Rode benchmarks/seed_database.py antes.')
+
+def key(result: dict) -> str:
+    return f'{result["scenario"]}@{result["concurrency"]}'
+
+def compare(results: list[dict], baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+
+    for result in results:
+        reference = baseline.get(key(result))
+
+        if not reference:
+            continue
+
+        if result['p99_ms'] > reference['p99_ms'] * (1 + tolerance):
+            regressions.append(f'{key(result)}: p99 {reference["p99_ms"]:.1f} -> {result["p99_ms"]:.1f} ms')
+        if result['throughput'] < reference['throughput'] * (1 - tolerance):
+            regressions.append(f'{key(result)}: vazão {reference["throughput"]:.0f} -> {result["throughput"]:.0f} req/s')
+        if result['errors'] > reference['errors']:
+            regressions.append(f'{key(result)}: erros {reference["errors"]} -> {result["errors"]}')
+
+    return regressions
+
+def main() -> int:
+    args = parse_args()
+    scenarios = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+
+    if unknown:
+        print(f'Cenários desconhecidos: {", ".join(unknown)}. Disponíveis: {", ".join(SCENARIOS)}.')
+        return 2
+
+    tokens = authenticate(args)
+    context = Context(args, tokens, find_transaction_type(args, tokens[0][1]))
+    baseline = None
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)['results']
+
+    print(f'{"cenário":<22} {"conc.":>5} {"reqs":>8} {"erros":>6} {"req/s":>9} {"p50 ms":>8} {"p99 ms":>8}  baseline p99 / req/s')
+    results = []
+
+    for name in scenarios:
+        for concurrency in [int(value) for value in args.concurrency.split(',')]:
+            result = run_scenario(name, concurrency, context)
+            results.append(result)
+            reference = (baseline or {}).get(key(result))
+            compared = f'  {reference["p99_ms"]:.1f} / {reference["throughput"]:.0f}' if reference else ''
+            print(
+                f'{name:<22} {concurrency:>5} {result["requests"]:>8} {result["errors"]:>6} '
+                f'{result["throughput"]:>9.1f} {result["p50_ms"]:>8.1f} {result["p99_ms"]:>8.1f}{compared}'
+            )
+
+    report = {
+        'base_url': args.base_url,
+        'duration': args.duration,
+        'users': args.users,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': {key(result): result for result in results}
+    }
+
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, 'w') as file:
+            json.dump(report, file, indent=2)
+
+        print(f'Resultados gravados em {os.path.abspath(path)}')
+
+    if baseline is None:
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+
+    if regressions:
+        print(f'FALHA: regressões acima de {args.tolerance:.0%}:')
+
+        for regression in regressions:
+            print(f'  {regression}')
+
+        return 1
+
+    print(f'OK: nenhuma regressão acima de {args.tolerance:.0%} em relação ao baseline.')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""Verifica que /pixkey/get_pixkeys não executa uma consulta por chave.
+
+Cria um banco SQLite temporário com usuários que têm quantidades diferentes de
+chaves pix, chama a rota pelo cliente de testes do Flask com a instrumentação
+ligada e compara o número de comandos SQL informado no cabeçalho
+Server-Timing. Termina com código 1 se a contagem crescer com o número de
+chaves. Não precisa de servidor nem de MySQL.
+
+Exemplo:
+    python benchmarks/pixkey_query_count.py --keys 1,10,200
+"""
+from datetime import datetime, timedelta
+import argparse
+import os
+import re
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+APP_KEY = 'pixkey-query-count-benchmark-app-key'
+
+def statements(response) -> int:
+    return int(re.search(r'desc="(\d+) statements"', response.headers['Server-Timing']).group(1))
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--keys', default='1,10,200')
+    args = parser.parse_args()
+    counts = [int(value) for value in args.keys.split(',')]
+
+    database = os.path.join(tempfile.mkdtemp(), 'pixkeys.sqlite')
+    os.environ['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{database}'
+    os.environ['APP_KEY'] = APP_KEY
+    os.environ['INSTRUMENTATION'] = 'true'
+
+    from app import create_app
+    from config.database import db
+    from models.pixkey_model import PixKey
+    from models.pixkey_types_model import PixKeyType
+    from models.user_model import User
+    import jwt
+
+    app = create_app()
+    client = app.test_client()
+    tokens = {}
+
+    with app.app_context():
+        db.create_all()
+        key_types = [PixKeyType(description) for description in ('CPF', 'EMAIL', 'TELEFONE', 'EVP')]
+        db.session.add_all(key_types)
+
+        for count in counts:
+            user = User(username=f'keys_{count}', password='!')
+            db.session.add(user)
+            db.session.flush()
+            db.session.add_all(PixKey(user.id, key_types[i % len(key_types)].id, f'{count}.{i}@bench.local') for i in range(count))
+            tokens[count] = jwt.encode({
+                'user': {'id': user.id, 'username': user.username, 'balance': 0},
+                'exp': datetime.utcnow() + timedelta(minutes=5)
+            }, APP_KEY)
+
+        db.session.commit()
+
+    results = {}
+
+    for count in counts:
+        headers = {'Authorization': tokens[count]}
+        # A primeira chamada aquece caches de processo; a segunda é a medida.
+        client.get('/pixkey/get_pixkeys?limit=500', headers=headers)
+        response = client.get('/pixkey/get_pixkeys?limit=500', headers=headers)
+        returned = len(response.json['data'])
+        results[count] = statements(response)
+        print(f'{count:>5} chaves: {returned:>5} retornadas, {results[count]} comandos SQL')
+
+        if returned != count:
+            print(f'FALHA: esperadas {count} chaves.')
+            return 1
+
+    if len(set(results.values())) != 1:
+        print('FALHA: o número de comandos SQL cresce com o número de chaves.')
+        return 1
+
+    print('OK: número de comandos SQL constante.')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,23 +1,52 @@
-from config.env import env
-from config.database import db
+from config.database import db, init_replicas
+from config.authentication import init_authentication
+from config.instrumentation import init_instrumentation
+from config.json_provider import create_json_provider
+from config.settings import init_settings
 from flask import Flask
 from flask_migrate import Migrate
+from werkzeug.middleware.proxy_fix import ProxyFix
 from auth import Auth
+from commands.ledger_commands import ledger_cli
+from commands.idempotency_commands import idempotency_cli
+from services.card_vault import init_card_vault
+from services.pix_resolver import init_pixkey_resolver
+from services.reference_cache import init_reference_caches
 
 from blueprints.transactions_blueprint import TransactionBlueprint
 from blueprints.pixkey_blueprint import PixKeyBlueprint
 from blueprints.credit_card_blueprint import CreditCardBlueprint
 
-app = Flask(__name__)
-app.config['SQLALCHEMY_DATABASE_URI'] = env("SQLALCHEMY_DATABASE_URI")
-db.init_app(app)
-migrate = Migrate(app, db)
-auth = Auth()
+migrate = Migrate()
 
-app.register_blueprint(auth, url_prefix='/auth')
-app.register_blueprint(TransactionBlueprint(), url_prefix='/transaction')
-app.register_blueprint(PixKeyBlueprint(), url_prefix='/pixkey')
-app.register_blueprint(CreditCardBlueprint(), url_prefix='/credit_card')
+def create_app() -> Flask:
+    app = Flask(__name__)
+    init_settings(app)
+
+    # Atrás de proxies reversos, o IP do cliente (usado pelos limites de login)
+    # vem do X-Forwarded-For, confiando apenas nos TRUSTED_PROXIES últimos saltos.
+    if app.config['TRUSTED_PROXIES']:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['TRUSTED_PROXIES'], x_proto=app.config['TRUSTED_PROXIES'])
+
+    app.json = create_json_provider(app, app.config['JSON_PROVIDER'])
+    init_authentication(app)
+    init_reference_caches(app)
+    init_pixkey_resolver(app)
+    init_card_vault(app)
+    db.init_app(app)
+    init_replicas(app)
+    init_instrumentation(app)
+    migrate.init_app(app, db)
+
+    app.cli.add_command(ledger_cli)
+    app.cli.add_command(idempotency_cli)
+
+    app.register_blueprint(Auth(), url_prefix='/auth')
+    app.register_blueprint(TransactionBlueprint(), url_prefix='/transaction')
+    app.register_blueprint(PixKeyBlueprint(), url_prefix='/pixkey')
+    app.register_blueprint(CreditCardBlueprint(), url_prefix='/credit_card')
+
+    return app
 
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    create_app().run(debug=True)
@@ -0,0 +1,32 @@
+from async_api.authentication import authenticate
+from config.database import READ_YOUR_WRITES_COOKIE, WROTE_INFO_KEY
+from quart import Blueprint, after_this_request, current_app, g, request
+
+class AuthenticatedBlueprint(Blueprint):
+    def __init__(self, name: str, import_name: str) -> None:
+        super().__init__(name, import_name)
+        self.before_request(authenticate)
+
+    async def _handle_request(self, handler_func, read_only: bool = False):
+        user_id = g.decoded_token['user']['id']
+        router = current_app.extensions['replica_router']
+
+        if read_only:
+            g.replica = router.choose(user_id, request.cookies.get(READ_YOUR_WRITES_COOKIE))
+
+        result = await handler_func(g.decoded_token)
+        session = g.get('async_session')
+
+        if router.enabled and session is not None and session.sync_session.info.get(WROTE_INFO_KEY):
+            self._stick_to_primary(router, user_id)
+
+        return result
+
+    def _stick_to_primary(self, router, user_id) -> None:
+        window = current_app.config['READ_YOUR_WRITES_WINDOW']
+        until = router.mark_write(user_id, window)
+
+        @after_this_request
+        async def set_cookie(response):
+            response.set_cookie(READ_YOUR_WRITES_COOKIE, f'{until:.3f}', max_age=window, httponly=True, samesite='Strict')
+            return response
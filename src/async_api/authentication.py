@@ -0,0 +1,16 @@
+from async_api.response import response
+from config.authentication import decode_token
+from quart import current_app, g, request
+import jwt
+
+async def authenticate():
+    try:
+        g.decoded_token = decode_token(
+            request.headers.get('Authorization'),
+            current_app.config['APP_KEY'],
+            current_app.extensions['token_cache']
+        )
+    except jwt.ExpiredSignatureError:
+        return response(status=False, code=401, message='Token expirado.')
+    except jwt.InvalidTokenError:
+        return response(status=False, code=401, message='Token inválido.')
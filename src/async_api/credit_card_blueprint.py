@@ -0,0 +1,46 @@
+from async_api.authenticated_blueprint import AuthenticatedBlueprint
+from async_api.database import async_session
+from async_api.response import response
+from quart import request
+from services.credit_card import CreditCardError, add_credit_card, list_credit_cards, remove_credit_card
+
+class CreditCardBlueprint(AuthenticatedBlueprint):
+    def __init__(self) -> None:
+        super().__init__('credit_card_bp', __name__)
+
+        @self.route('/get_credit_cards', methods=['GET'])
+        async def get_credit_cards():
+            return await self._handle_request(self._get_credit_cards, read_only=True)
+
+        @self.route('/add_credit_card', methods=['POST'])
+        async def add_credit_card():
+            return await self._handle_request(self._add_credit_card)
+
+        @self.route('/remove_credit_card', methods=['DELETE'])
+        async def remove_credit_card():
+            return await self._handle_request(self._remove_credit_card)
+
+    async def _get_credit_cards(self, decoded_token):
+        return response(
+            status=True,
+            code=200,
+            message='A solicitação foi concluída com sucesso.',
+            data=await async_session().run_sync(list_credit_cards, decoded_token['user']['id'])
+        )
+
+    async def _add_credit_card(self, decoded_token):
+        data = await request.get_json()
+        try:
+            credit_card = await async_session().run_sync(add_credit_card, decoded_token['user']['id'], data)
+        except CreditCardError as error:
+            return response(status=False, code=error.code, message=error.message)
+
+        return response(status=True, code=200, message='Cartão de crédito adicionado com sucesso.', data=credit_card)
+
+    async def _remove_credit_card(self, decoded_token):
+        data = await request.get_json()
+
+        if await async_session().run_sync(remove_credit_card, decoded_token['user']['id'], data['credit_card_id']):
+            return response(status=True, code=200, message='Cartão de crédito removido com sucesso.')
+
+        return response(status=False, code=404, message='Cartão de crédito não encontrado.')
@@ -0,0 +1,61 @@
+from config.database import REPLICA_INFO_KEY, AsyncRoutingSession, ReplicaRouter
+from config.settings import REPLICA_BIND_PREFIX, SettingsError
+from quart import Quart, current_app, g
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+ASYNC_DRIVERS = {
+    'mysql': 'mysql+aiomysql',
+    'sqlite': 'sqlite+aiosqlite'
+}
+
+def async_database_uri(uri: str) -> str:
+    url = make_url(uri)
+    backend = url.get_backend_name()
+
+    if backend not in ASYNC_DRIVERS:
+        raise SettingsError(f'Banco de dados sem driver assíncrono configurado: {backend}.')
+
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+def _create_engine(uri: str, options: dict) -> AsyncEngine:
+    return create_async_engine(async_database_uri(uri), **{key: value for key, value in options.items() if key != 'url'})
+
+def init_async_database(app: Quart) -> async_sessionmaker:
+    engine = _create_engine(app.config['SQLALCHEMY_DATABASE_URI'], app.config['SQLALCHEMY_ENGINE_OPTIONS'])
+    # A sessão síncrona de cada AsyncSession escolhe a réplica pelo `sync_engine`.
+    replicas = [
+        _create_engine(bind['url'], bind)
+        for key, bind in app.config['SQLALCHEMY_BINDS'].items()
+        if key.startswith(REPLICA_BIND_PREFIX)
+    ]
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False, sync_session_class=AsyncRoutingSession)
+    app.extensions['async_sessionmaker'] = sessionmaker
+    app.extensions['replica_router'] = ReplicaRouter([replica.sync_engine for replica in replicas])
+
+    @app.teardown_appcontext
+    async def close_session(exception) -> None:
+        session = g.pop('async_session', None)
+
+        if session is not None:
+            await session.close()
+
+    @app.after_serving
+    async def dispose_engine() -> None:
+        for disposable in (engine, *replicas):
+            await disposable.dispose()
+
+    return sessionmaker
+
+def new_session() -> AsyncSession:
+    session = current_app.extensions['async_sessionmaker']()
+    session.sync_session.info[REPLICA_INFO_KEY] = g.get('replica')
+    return session
+
+def async_session() -> AsyncSession:
+    # Uma sessão por requisição, fechada no teardown. O código síncrono dos
+    # serviços roda sobre ela com `run_sync`, sem ocupar uma thread por consulta.
+    if 'async_session' not in g:
+        g.async_session = new_session()
+
+    return g.async_session
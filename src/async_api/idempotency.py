@@ -0,0 +1,52 @@
+from async_api.database import async_session
+from async_api.response import response
+from config.database import DEFERRED_COMMIT_INFO_KEY
+from datetime import timedelta
+from functools import wraps
+from quart import current_app, request
+from services.idempotency import IDEMPOTENCY_HEADER, MAX_KEY_LENGTH, REPLAYED_HEADER, claim, complete, release, replay_error
+
+def _replay(record):
+    error = replay_error(record, request.endpoint)
+
+    if error:
+        code, message = error
+        return response(status=False, code=code, message=message)
+
+    replayed = current_app.response_class(record.response_body, status=record.status_code, mimetype='application/json')
+    replayed.headers[REPLAYED_HEADER] = 'true'
+    return replayed
+
+def idempotent(handler_func):
+    @wraps(handler_func)
+    async def wrapper(decoded_token):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+
+        if not key:
+            return await handler_func(decoded_token)
+
+        if len(key) > MAX_KEY_LENGTH:
+            return response(status=False, code=400, message='Chave de idempotência inválida.')
+
+        session = async_session()
+        ttl = timedelta(seconds=current_app.config['IDEMPOTENCY_TTL'])
+        lease = timedelta(seconds=current_app.config['IDEMPOTENCY_LEASE'])
+        record, existing = await session.run_sync(claim, decoded_token['user']['id'], key, request.endpoint, lease)
+
+        if record is None:
+            return _replay(existing)
+
+        session.sync_session.info[DEFERRED_COMMIT_INFO_KEY] = True
+
+        try:
+            result, code = await handler_func(decoded_token)
+            await session.run_sync(complete, record, code, await result.get_data(as_text=True), ttl)
+        except Exception:
+            await session.run_sync(release, record)
+            raise
+        finally:
+            session.sync_session.info.pop(DEFERRED_COMMIT_INFO_KEY, None)
+
+        return result, code
+
+    return wrapper
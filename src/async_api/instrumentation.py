@@ -0,0 +1,50 @@
+from config.instrumentation import METRICS_MIMETYPE, Metrics, count_bytes_async, finish_request, metrics_error, start_request
+from quart import Quart, current_app, g, request
+from quart.wrappers.response import IterableBody
+
+# Os hooks precisam ser corrotinas: funções síncronas rodam em outra thread e o
+# ContextVar com as estatísticas não chegaria ao handler.
+async def _start() -> None:
+    if current_app.config['INSTRUMENTATION']:
+        g.request_stats = start_request()
+
+async def _finish(response):
+    stats = g.pop('request_stats', None)
+
+    if stats is None:
+        return response
+
+    finish = finish_request(
+        stats,
+        current_app.extensions['metrics'],
+        request.endpoint,
+        request.method,
+        response.status_code,
+        current_app.config['STATEMENT_BUDGET']
+    )
+    response.headers['Server-Timing'] = stats.server_timing()
+
+    if isinstance(response.response, IterableBody):
+        response.response = IterableBody(count_bytes_async(response.response.iter, stats, finish))
+    else:
+        stats.response_bytes = response.content_length or 0
+        finish()
+
+    return response
+
+async def _metrics_view():
+    error = metrics_error(current_app.config, request.headers.get('Authorization'))
+
+    if error:
+        status, message = error
+        return current_app.response_class(message, status=status, mimetype='text/plain')
+
+    return current_app.response_class(current_app.extensions['metrics'].render(), mimetype=METRICS_MIMETYPE)
+
+def init_instrumentation(app: Quart) -> Metrics:
+    metrics = Metrics()
+    app.extensions['metrics'] = metrics
+    app.before_request(_start)
+    app.after_request(_finish)
+    app.add_url_rule('/metrics', 'metrics', _metrics_view)
+    return metrics
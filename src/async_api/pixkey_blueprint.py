@@ -0,0 +1,137 @@
+from async_api.authenticated_blueprint import AuthenticatedBlueprint
+from async_api.database import async_session
+from config.pagination import InvalidPageRequest, parse_limit
+from async_api.response import cacheable, response
+from quart import current_app, request
+from services.pixkey import MAX_BATCH_SIZE, add_pixkey, add_pixkey_batch, list_pixkeys, parse_key_type, resolve_pixkey_batch, search_pixkey
+from services.pixkey_normalization import PixKeyError
+from services.reference_cache import pixkey_types_cache
+
+class PixKeyBlueprint(AuthenticatedBlueprint):
+    def __init__(self) -> None:
+        super().__init__('pixkeybp', __name__)
+
+        @self.route('/get_pixkeys', methods=['GET'])
+        async def get_pixkeys():
+            return await self._handle_request(self._get_pixkeys, read_only=True)
+
+        @self.route('/get_pixkey_types', methods=['GET'])
+        async def get_pixkey_types():
+            return await self._handle_request(self._get_pixkey_types, read_only=True)
+
+        @self.route('/add_pixkey_type', methods=['POST'])
+        async def add_pixkey_type():
+            return await self._handle_request(self._add_pixkey_type)
+
+        @self.route('/add_pixkey', methods=['POST', 'PUT'])
+        async def add_pixkey():
+            return await self._handle_request(self._add_pixkey)
+
+        @self.route('/search_pixkey', methods=['GET'])
+        async def search_pixkey():
+            return await self._handle_request(self._search_pixkey, read_only=True)
+
+        @self.route('/add_batch', methods=['POST'])
+        async def add_batch():
+            return await self._handle_request(self._add_batch)
+
+        @self.route('/resolve_batch', methods=['POST'])
+        async def resolve_batch():
+            return await self._handle_request(self._resolve_batch, read_only=True)
+
+    async def _handle_request(self, handler_func, read_only: bool = False):
+        try:
+            return await super()._handle_request(handler_func, read_only)
+        except InvalidPageRequest:
+            return response(status=False, code=400, message='Parâmetros de paginação inválidos.')
+
+    async def _get_pixkeys(self, decoded_token):
+        pixkeys, next_cursor = await async_session().run_sync(
+            list_pixkeys,
+            decoded_token['user']['id'],
+            parse_key_type(request.args.get('key_type_id')),
+            request.args.get('cursor'),
+            parse_limit(request.args.get('limit'))
+        )
+
+        return response(
+            status=True,
+            code=200,
+            message='A solicitação foi concluída com sucesso.',
+            data=pixkeys,
+            next_cursor=next_cursor
+        ) if pixkeys else response(status=False, code=404, message='Nenhuma chave pix registrada para o usuário atual.')
+
+    async def _get_pixkey_types(self, decoded_token):
+        session = async_session()
+        pixkey_types = await session.run_sync(pixkey_types_cache.all)
+
+        return await cacheable(
+            response(
+                status=True,
+                code=200,
+                message='A solicitação foi concluída com sucesso.',
+                data=pixkey_types
+            ),
+            etag=await session.run_sync(pixkey_types_cache.etag),
+            max_age=current_app.config['REFERENCE_CACHE_TTL']
+        )
+
+    async def _add_pixkey_type(self, decoded_token):
+        data = await request.get_json()
+        await async_session().run_sync(pixkey_types_cache.add, description=data['description'])
+
+        return response(status=True, code=200, message='Tipo de chave pix adicionado com sucesso.')
+
+    async def _add_pixkey(self, decoded_token):
+        data = await request.get_json()
+        try:
+            added = await async_session().run_sync(add_pixkey, decoded_token['user']['id'], data['key_type_id'], data['key'])
+        except PixKeyError as error:
+            return response(status=False, code=error.code, message=error.message)
+
+        if not added:
+            return response(status=False, code=404, message='Essa chave pix já foi utilizada.')
+
+        return response(status=True, code=200, message='Chave pix adicionada com sucesso.')
+
+    async def _search_pixkey(self, decoded_token):
+        data = await request.get_json()
+        user = await async_session().run_sync(search_pixkey, data['pixkey'])
+
+        if not user:
+            return response(status=False, code=404, message='Nenhuma chave pix foi encontrada.')
+
+        return response(status=True, code=200, message='A solicitação foi concluída com sucesso.', data=user)
+
+    async def _add_batch(self, decoded_token):
+        pixkeys = (await request.get_json()).get('pixkeys')
+
+        if not isinstance(pixkeys, list) or not pixkeys or len(pixkeys) > MAX_BATCH_SIZE:
+            return response(status=False, code=400, message=f'Informe entre 1 e {MAX_BATCH_SIZE} chaves pix.')
+
+        results = await async_session().run_sync(add_pixkey_batch, decoded_token['user']['id'], pixkeys)
+        succeeded = sum(1 for result in results if result['status'] == 'success')
+
+        return response(
+            status=True,
+            code=200,
+            message=f'{succeeded} de {len(results)} chaves pix adicionadas com sucesso.',
+            data={'succeeded': succeeded, 'failed': len(results) - succeeded, 'results': results}
+        )
+
+    async def _resolve_batch(self, decoded_token):
+        pixkeys = (await request.get_json()).get('pixkeys')
+
+        if not isinstance(pixkeys, list) or not pixkeys or len(pixkeys) > MAX_BATCH_SIZE or not all(isinstance(key, str) for key in pixkeys):
+            return response(status=False, code=400, message=f'Informe entre 1 e {MAX_BATCH_SIZE} chaves pix.')
+
+        results = await async_session().run_sync(resolve_pixkey_batch, pixkeys)
+        found = sum(1 for result in results if result['user'])
+
+        return response(
+            status=True,
+            code=200,
+            message=f'{found} de {len(results)} chaves pix encontradas.',
+            data={'found': found, 'not_found': len(results) - found, 'results': results}
+        )
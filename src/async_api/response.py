@@ -0,0 +1,46 @@
+from config.response import envelope, stream_chunks
+from quart import current_app, jsonify, request
+from quart.wrappers import Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.util import greenlet_spawn
+from typing import AsyncIterator, Iterable, Iterator
+
+_END = object()
+
+def response(
+    status: bool,
+    code: int,
+    message: str,
+    error: Exception | None = None,
+    data: list[dict] | None = None,
+    next_cursor: str | None = None
+) -> tuple[Response, int]:
+    return jsonify(envelope(status, code, message, error, data, next_cursor)), code
+
+async def cacheable(result: tuple, etag: str, max_age: int) -> Response:
+    quart_response, code = result
+    quart_response.status_code = code
+    quart_response.set_etag(etag)
+    quart_response.cache_control.private = True
+    quart_response.cache_control.max_age = max_age
+    return await quart_response.make_conditional(request)
+
+async def iterate(chunks: Iterator, session: AsyncSession) -> AsyncIterator:
+    # Cada `next` roda em um greenlet: as consultas feitas pelo gerador síncrono
+    # (cursor no servidor, caches) aguardam o driver assíncrono sem bloquear o loop.
+    # O streaming termina depois do teardown da requisição, então a sessão é própria.
+    try:
+        while (chunk := await greenlet_spawn(next, chunks, _END)) is not _END:
+            yield chunk
+    finally:
+        await session.close()
+
+def stream_response(
+    status: bool,
+    code: int,
+    message: str,
+    rows: Iterable[dict],
+    session: AsyncSession
+) -> Response:
+    chunks = stream_chunks(current_app.json.dumps, status, code, message, rows)
+    return current_app.response_class(iterate(chunks, session), status=code, mimetype='application/json')
@@ -0,0 +1,273 @@
+from async_api.authenticated_blueprint import AuthenticatedBlueprint
+from async_api.database import async_session, new_session
+from async_api.idempotency import idempotent
+from async_api.response import cacheable, iterate, response, stream_response
+from config.pagination import InvalidPageRequest, parse_limit
+from datetime import datetime
+from quart import current_app, request
+from services.export import ExportError, export_metadata, export_rows
+from services.history import HistoryFilter, current_balance, format_full_transactions, history_page, history_stream, split_history
+from services.reference_cache import transaction_types_cache
+from services.transfer import MAX_BATCH_SIZE, TransferError, deposit, retry_delay, transfer, transfer_batch
+from sqlalchemy.exc import OperationalError
+import asyncio
+import itertools
+
+class TransactionBlueprint(AuthenticatedBlueprint):
+    def __init__(self) -> None:
+        super().__init__('transactionbp', __name__)
+
+        @self.route('/get_balance', methods=['GET'])
+        async def get_balance():
+            return await self._handle_request(self._get_balance, read_only=True)
+
+        @self.route('/get_current_balance', methods=['GET'])
+        async def get_current_balance():
+            return await self._handle_request(self._get_current_balance, read_only=True)
+
+        @self.route('/deposit', methods=['POST'])
+        async def deposit():
+            return await self._handle_request(idempotent(self._deposit))
+
+        @self.route('/get_transactions', methods=['GET'])
+        async def get_transactions():
+            return await self._handle_request(self._get_transactions, read_only=True)
+
+        @self.route('/get_transaction_types', methods=['GET'])
+        async def get_transaction_types():
+            return await self._handle_request(self._get_transaction_types, read_only=True)
+
+        @self.route('/get_transaction_tax', methods=['GET'])
+        async def get_transaction_tax():
+            return await self._handle_request(self._get_transaction_tax, read_only=True)
+
+        @self.route('/add_transaction_type', methods=['POST'])
+        async def add_transaction_type():
+            return await self._handle_request(self._add_transaction_type)
+
+        @self.route('/send_transaction', methods=['POST'])
+        async def send_transaction():
+            return await self._handle_request(idempotent(self._send_transaction))
+
+        @self.route('/send_batch', methods=['POST'])
+        async def send_batch():
+            return await self._handle_request(idempotent(self._send_batch))
+
+        @self.route('/export', methods=['GET'])
+        async def export():
+            return await self._handle_request(self._export, read_only=True)
+
+        @self.route('/get_full_transaction', methods=['GET'])
+        async def get_full_transaction():
+            return await self._handle_request(self._get_full_transaction, read_only=True)
+
+    async def _handle_request(self, handler_func, read_only: bool = False):
+        try:
+            return await super()._handle_request(handler_func, read_only)
+        except InvalidPageRequest:
+            return response(status=False, code=400, message='Parâmetros de paginação inválidos.')
+
+    async def _get_balance(self, decoded_token):
+        user_id = decoded_token['user']['id']
+        page_args = self._page_args()
+
+        def load(session) -> tuple[dict, str | None]:
+            transactions, next_cursor = history_page(session, user_id, *page_args)
+            return {'balance': current_balance(session, user_id), **split_history(session, transactions, user_id)}, next_cursor
+
+        data, next_cursor = await async_session().run_sync(load)
+
+        return response(
+            status=True,
+            code=200,
+            message='A solicitação foi concluída com sucesso.',
+            data=data,
+            next_cursor=next_cursor
+        )
+
+    async def _get_current_balance(self, decoded_token):
+        balance = await async_session().run_sync(current_balance, decoded_token['user']['id'])
+
+        if balance is None:
+            return response(status=False, code=404, message='Usuário não encontrado.')
+
+        return response(
+            status=True,
+            code=200,
+            message='A solicitação foi concluída com sucesso.',
+            data={'balance': balance}
+        )
+
+    async def _deposit(self, decoded_token):
+        data = await request.get_json()
+
+        try:
+            await self._with_retry(deposit, decoded_token['user']['id'], data['amount'])
+        except TransferError as error:
+            return response(status=False, code=error.code, message=error.message)
+
+        return response(status=True, code=200, message='Depósito realizado com sucesso.')
+
+    async def _get_transactions(self, decoded_token):
+        user_id = decoded_token['user']['id']
+        page_args = self._page_args()
+
+        def load(session) -> tuple[dict, str | None]:
+            transactions, next_cursor = history_page(session, user_id, *page_args)
+            return split_history(session, transactions, user_id), next_cursor
+
+        data, next_cursor = await async_session().run_sync(load)
+
+        return response(
+            status=True,
+            code=200,
+            message='A solicitação foi concluída com sucesso.',
+            data=data,
+            next_cursor=next_cursor
+        )
+
+    async def _get_transaction_types(self, decoded_token):
+        session = async_session()
+        transaction_types = await session.run_sync(transaction_types_cache.all)
+
+        return await cacheable(
+            response(status=True, code=200, message='Tipos de transações obtidos com sucesso', data=transaction_types),
+            etag=await session.run_sync(transaction_types_cache.etag),
+            max_age=current_app.config['REFERENCE_CACHE_TTL']
+        )
+
+    async def _add_transaction_type(self, decoded_token):
+        data = await request.get_json()
+        await async_session().run_sync(transaction_types_cache.add, description=data['description'], tax=data['tax'])
+
+        return response(status=True, code=200, message='Tipo de transação adicionado com sucesso.')
+
+    async def _send_transaction(self, decoded_token):
+        data = await request.get_json()
+
+        try:
+            await self._with_retry(
+                transfer,
+                sender_id=decoded_token['user']['id'],
+                receiver_id=data['receiver'],
+                amount=data['amount'],
+                transaction_type_id=data['transaction_type']
+            )
+        except TransferError as error:
+            return response(status=False, code=error.code, message=error.message)
+
+        return response(status=True, code=200, message='Transação realizada com sucesso.')
+
+    async def _send_batch(self, decoded_token):
+        transfers = (await request.get_json()).get('transfers')
+
+        if not isinstance(transfers, list) or not transfers or len(transfers) > MAX_BATCH_SIZE:
+            return response(status=False, code=400, message=f'Informe entre 1 e {MAX_BATCH_SIZE} transferências.')
+
+        try:
+            results = await self._with_retry(transfer_batch, decoded_token['user']['id'], transfers)
+        except TransferError as error:
+            return response(status=False, code=error.code, message=error.message)
+
+        succeeded = sum(1 for result in results if result['status'] == 'success')
+
+        return response(
+            status=True,
+            code=200,
+            message=f'{succeeded} de {len(results)} transferências realizadas com sucesso.',
+            data={'succeeded': succeeded, 'failed': len(results) - succeeded, 'results': results}
+        )
+
+    async def _get_transaction_tax(self, decoded_token):
+        transaction_type_id = (await request.get_json())['transaction_type_id']
+        transaction_type = await async_session().run_sync(
+            lambda session: transaction_types_cache.get(transaction_type_id, session)
+        )
+
+        if not transaction_type:
+            return response(status=False, code=404, message='Tipo de transação não encontrado.')
+
+        return response(
+            status=True,
+            code=200,
+            message='Taxa de transação obtida com sucesso.',
+            data={'tax': transaction_type['tax']}
+        )
+
+    async def _get_full_transaction(self, decoded_token):
+        user_id = decoded_token['user']['id']
+
+        if request.args.get('stream') == 'true':
+            session, rows = self._history_stream(user_id)
+            return stream_response(
+                status=True,
+                code=200,
+                message='Detalhes da transação obtidos com sucesso.',
+                rows=rows,
+                session=session
+            )
+
+        page_args = self._page_args()
+
+        def load(session) -> tuple[list, str | None]:
+            transactions, next_cursor = history_page(session, user_id, *page_args)
+            return format_full_transactions(session, transactions), next_cursor
+
+        data, next_cursor = await async_session().run_sync(load)
+
+        if not data:
+            return response(status=False, code=404, message='Transação não encontrada.')
+
+        return response(
+            status=True,
+            code=200,
+            message='Detalhes da transação obtidos com sucesso.',
+            data=data,
+            next_cursor=next_cursor
+        )
+
+    async def _export(self, decoded_token):
+        export_format = request.args.get('format', 'ndjson')
+        compression = request.args.get('compression', 'none')
+        basename = f'transactions_{datetime.utcnow().strftime("%Y%m%d_%H%M%S")}'
+
+        try:
+            filename, mimetype = export_metadata(export_format, compression, basename)
+        except ExportError as error:
+            return response(status=False, code=400, message=str(error))
+
+        session, rows = self._history_stream(decoded_token['user']['id'], verify_count=True)
+        chunks = export_rows(rows, export_format, compression, basename, current_app.json.dumps)
+
+        return current_app.response_class(
+            iterate(chunks, session),
+            status=200,
+            mimetype=mimetype,
+            headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+        )
+
+    async def _with_retry(self, operation, *args, **kwargs):
+        # Cada tentativa roda no run_sync; a espera entre elas fica fora, no loop.
+        for attempt in itertools.count():
+            try:
+                return await async_session().run_sync(operation, *args, retry=False, **kwargs)
+            except OperationalError as error:
+                await asyncio.sleep(retry_delay(attempt, error))
+
+    def _page_args(self) -> tuple:
+        return (
+            HistoryFilter.from_args(request.args),
+            request.args.get('cursor'),
+            parse_limit(request.args.get('limit'))
+        )
+
+    def _history_stream(self, user_id, verify_count: bool = False):
+        history_filter = HistoryFilter.from_args(request.args)
+        session = new_session()
+        sync_session = session.sync_session
+
+        def rows():
+            # A consulta só é montada na primeira iteração, já dentro do greenlet.
+            yield from history_stream(sync_session, user_id, history_filter, verify_count)
+
+        return session, rows()
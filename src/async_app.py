@@ -0,0 +1,33 @@
+from async_api.database import init_async_database
+from async_api.instrumentation import init_instrumentation
+from config.authentication import init_authentication
+from config.json_provider import create_json_provider
+from config.settings import init_settings
+from quart import Quart
+from services.card_vault import init_card_vault
+from services.pix_resolver import init_pixkey_resolver
+from services.reference_cache import init_reference_caches
+
+from async_api.transactions_blueprint import TransactionBlueprint
+from async_api.pixkey_blueprint import PixKeyBlueprint
+from async_api.credit_card_blueprint import CreditCardBlueprint
+
+def create_async_app() -> Quart:
+    app = Quart(__name__)
+    init_settings(app)
+    app.json = create_json_provider(app, app.config['JSON_PROVIDER'])
+    init_authentication(app)
+    init_reference_caches(app)
+    init_pixkey_resolver(app)
+    init_card_vault(app)
+    init_async_database(app)
+    init_instrumentation(app)
+
+    app.register_blueprint(TransactionBlueprint(), url_prefix='/transaction')
+    app.register_blueprint(PixKeyBlueprint(), url_prefix='/pixkey')
+    app.register_blueprint(CreditCardBlueprint(), url_prefix='/credit_card')
+
+    return app
+
+if __name__ == '__main__':
+    create_async_app().run(debug=True)
@@ -1,11 +1,11 @@
 from config.database import db
-from config.env import env
+from config.passwords import HashingBusy
 from config.response import response
 from models.user_model import User
-from flask import Blueprint, request, jsonify
-from werkzeug.security import generate_password_hash, check_password_hash
+from flask import Blueprint, current_app, request, jsonify
 from datetime import datetime, timedelta
 import jwt
+import math
 
 class Auth(Blueprint):
     def __init__(self) -> None:
@@ -15,6 +15,9 @@ class Auth(Blueprint):
         def register() -> jsonify:
             data = request.json
 
+            if not _valid_credentials(data):
+                return _invalid_credentials()
+
             check_user = db.session.query(User).filter_by(username=data['username']).first()
 
             if check_user:
@@ -24,9 +27,14 @@ class Auth(Blueprint):
                     message='O usuário informado já está registrado.',
                 )
             else:
+                try:
+                    password = current_app.extensions['password_hasher'].hash(data['password'])
+                except HashingBusy:
+                    return _busy()
+
                 new_user = User(
                     username=data['username'],
-                    password=generate_password_hash(data['password'], 'pbkdf2:sha256')
+                    password=password
                 )
                 db.session.add(new_user)
                 db.session.commit()
@@ -41,34 +49,84 @@ class Auth(Blueprint):
         def login() -> jsonify:
             data = request.json
 
+            if not _valid_credentials(data):
+                return _invalid_credentials()
+
+            # Os limites são verificados antes de qualquer consulta ou hash, para
+            # que tentativas de força bruta não consumam CPU.
+            wait = _login_wait(data['username'])
+
+            if wait:
+                body, code = response(
+                    status=False,
+                    code=429,
+                    message='Muitas tentativas de login. Tente novamente em instantes.'
+                )
+                body.headers['Retry-After'] = str(math.ceil(wait))
+                return body, code
+
+            hasher = current_app.extensions['password_hasher']
             user = db.session.query(User).filter_by(username=data['username']).first()
 
-            if user:
-                if check_password_hash(user.password, data['password']):
-                    token = jwt.encode({
-                        'user': {
-                            'id': user.id,
-                            'username': user.username,
-                            'balance': user.balance,
-                        },
-                        'exp': datetime.utcnow() + timedelta(minutes=30)
-                    }, env('APP_KEY'))
-
-                    return response(
-                        status=True,
-                        code=200,
-                        message='Usuário autenticado com sucesso.',
-                        data={'token': token}
-                    )
-                else:
-                    return response(
-                        status=False,
-                        code=401,
-                        message='Credenciais inválidas.'
-                    )
+            try:
+                authenticated = hasher.verify(user.password if user else None, data['password'])
+
+                if authenticated and hasher.needs_rehash(user.password):
+                    user.password = hasher.hash(data['password'])
+                    db.session.commit()
+            except HashingBusy:
+                return _busy()
+
+            if authenticated:
+                token = jwt.encode({
+                    'user': {
+                        'id': user.id,
+                        'username': user.username,
+                        'balance': format(user.balance, 'f'),
+                    },
+                    'exp': datetime.utcnow() + timedelta(minutes=30)
+                }, current_app.config['APP_KEY'])
+
+                return response(
+                    status=True,
+                    code=200,
+                    message='Usuário autenticado com sucesso.',
+                    data={'token': token}
+                )
             else:
                 return response(
-                        status=False,
-                        code=401,
-                        message='Credenciais inválidas.'
-                    )
+                    status=False,
+                    code=401,
+                    message='Credenciais inválidas.'
+                )
+
+def _valid_credentials(data) -> bool:
+    return (
+        isinstance(data, dict)
+        and isinstance(data.get('username'), str)
+        and isinstance(data.get('password'), str)
+        and bool(data['username'].strip())
+    )
+
+def _invalid_credentials() -> jsonify:
+    return response(
+        status=False,
+        code=400,
+        message='Informe o usuário e a senha.'
+    )
+
+def _login_wait(username: str) -> float:
+    config = current_app.config
+    limiter = current_app.extensions['login_limiter']
+
+    return max(
+        limiter.acquire(f'ip:{request.remote_addr}', config['LOGIN_IP_BURST'], config['LOGIN_IP_PER_MINUTE']),
+        limiter.acquire(f'user:{username.strip().lower()}', config['LOGIN_USER_BURST'], config['LOGIN_USER_PER_MINUTE'])
+    )
+
+def _busy() -> jsonify:
+    return response(
+        status=False,
+        code=503,
+        message='Serviço de autenticação sobrecarregado. Tente novamente em instantes.'
+    )
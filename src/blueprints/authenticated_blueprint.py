@@ -0,0 +1,31 @@
+from config.authentication import authenticate
+from config.database import READ_YOUR_WRITES_COOKIE, REPLICA_INFO_KEY, WROTE_INFO_KEY, db
+from flask import Blueprint, after_this_request, current_app, g, jsonify, request
+
+class AuthenticatedBlueprint(Blueprint):
+    def __init__(self, name: str, import_name: str) -> None:
+        super().__init__(name, import_name)
+        self.before_request(authenticate)
+
+    def _handle_request(self, handler_func, read_only: bool = False) -> jsonify:
+        user_id = g.decoded_token['user']['id']
+        router = current_app.extensions['replica_router']
+
+        if read_only:
+            db.session.info[REPLICA_INFO_KEY] = router.choose(user_id, request.cookies.get(READ_YOUR_WRITES_COOKIE))
+
+        result = handler_func(g.decoded_token)
+
+        if router.enabled and db.session.info.get(WROTE_INFO_KEY):
+            self._stick_to_primary(router, user_id)
+
+        return result
+
+    def _stick_to_primary(self, router, user_id) -> None:
+        window = current_app.config['READ_YOUR_WRITES_WINDOW']
+        until = router.mark_write(user_id, window)
+
+        @after_this_request
+        def set_cookie(response):
+            response.set_cookie(READ_YOUR_WRITES_COOKIE, f'{until:.3f}', max_age=window, httponly=True, samesite='Strict')
+            return response
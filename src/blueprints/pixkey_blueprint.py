@@ -1,23 +1,23 @@
 from config.database import db
-from config.env import env
-from config.response import response
-from flask import Blueprint, request, jsonify
-import jwt
-from models.user_model import User
-from models.pixkey_model import PixKey
-from models.pixkey_types_model import PixKeyType
-
-class PixKeyBlueprint(Blueprint):
+from config.pagination import InvalidPageRequest, parse_limit
+from config.response import cacheable, response
+from blueprints.authenticated_blueprint import AuthenticatedBlueprint
+from flask import current_app, request, jsonify
+from services.pixkey import MAX_BATCH_SIZE, add_pixkey, add_pixkey_batch, list_pixkeys, parse_key_type, resolve_pixkey_batch, search_pixkey
+from services.pixkey_normalization import PixKeyError
+from services.reference_cache import pixkey_types_cache
+
+class PixKeyBlueprint(AuthenticatedBlueprint):
     def __init__(self) -> None:
         super().__init__('pixkeybp', __name__)
 
         @self.route('/get_pixkeys', methods=['GET'])
         def get_pixkeys() -> jsonify:
-            return self._handle_request(self._get_pixkeys)
+            return self._handle_request(self._get_pixkeys, read_only=True)
 
         @self.route('/get_pixkey_types', methods=['GET'])
         def get_pixkey_types() -> jsonify:
-            return self._handle_request(self._get_pixkey_types)
+            return self._handle_request(self._get_pixkey_types, read_only=True)
 
         @self.route('/add_pixkey_type', methods=['POST'])
         def add_pixkey_type() -> jsonify:
@@ -29,79 +29,104 @@ class PixKeyBlueprint(Blueprint):
         
         @self.route('/search_pixkey', methods=['GET'])
         def search_pixkey() -> jsonify:
-            return self._handle_request(self._search_pixkey)
+            return self._handle_request(self._search_pixkey, read_only=True)
 
-    def _handle_request(self, handler_func) -> jsonify:
-        try:
-            token = request.headers.get('Authorization')
-            decoded_token = jwt.decode(jwt=token, key=env('APP_KEY'), options={"verify_signature": False})
+        @self.route('/add_batch', methods=['POST'])
+        def add_batch() -> jsonify:
+            return self._handle_request(self._add_batch)
+
+        @self.route('/resolve_batch', methods=['POST'])
+        def resolve_batch() -> jsonify:
+            return self._handle_request(self._resolve_batch, read_only=True)
 
-            return handler_func(decoded_token)
-        except jwt.ExpiredSignatureError:
-            return response(status=False, code=401, message='Token expirado.')
-        except jwt.InvalidTokenError:
-            return response(status=False, code=401, message='Token inválido.')
+    def _handle_request(self, handler_func, read_only: bool = False) -> jsonify:
+        try:
+            return super()._handle_request(handler_func, read_only)
+        except InvalidPageRequest:
+            return response(status=False, code=400, message='Parâmetros de paginação inválidos.')
 
     def _get_pixkeys(self, decoded_token) -> jsonify:
-        pixkeys = db.session.query(PixKey).filter_by(user_id=decoded_token['user']['id']).all()
+        pixkeys, next_cursor = list_pixkeys(
+            db.session,
+            decoded_token['user']['id'],
+            parse_key_type(request.args.get('key_type_id')),
+            request.args.get('cursor'),
+            parse_limit(request.args.get('limit'))
+        )
 
         return response(
             status=True,
             code=200,
             message='A solicitação foi concluída com sucesso.',
-            data=[self._format_pixkey(pk) for pk in pixkeys]
+            data=pixkeys,
+            next_cursor=next_cursor
         ) if pixkeys else response(status=False, code=404, message='Nenhuma chave pix registrada para o usuário atual.')
 
     def _get_pixkey_types(self, decoded_token) -> jsonify:
-        pixkey_types = db.session.query(PixKeyType).all()
-
-        return response(
-            status=True,
-            code=200,
-            message='A solicitação foi concluída com sucesso.',
-            data=[{'id': pkt.id, 'description': pkt.description} for pkt in pixkey_types]
+        return cacheable(
+            response(
+                status=True,
+                code=200,
+                message='A solicitação foi concluída com sucesso.',
+                data=pixkey_types_cache.all()
+            ),
+            etag=pixkey_types_cache.etag(),
+            max_age=current_app.config['REFERENCE_CACHE_TTL']
         )
 
     def _add_pixkey_type(self, decoded_token) -> jsonify:
-        data = request.json
-        new_pixkey_type = PixKeyType(description=data['description'])
-
-        db.session.add(new_pixkey_type)
-        db.session.commit()
-
+        pixkey_types_cache.add(db.session, description=request.json['description'])
         return response(status=True, code=200, message='Tipo de chave pix adicionado com sucesso.')
 
     def _add_pixkey(self, decoded_token) -> jsonify:
         data = request.json
-        check_pixkey = db.session.query(PixKey).filter_by(key=data['key']).first()
 
-        if check_pixkey:
+        try:
+            added = add_pixkey(db.session, decoded_token['user']['id'], data['key_type_id'], data['key'])
+        except PixKeyError as error:
+            return response(status=False, code=error.code, message=error.message)
+
+        if not added:
             return response(status=False, code=404, message='Essa chave pix já foi utilizada.')
-        else:
-            new_pixkey = PixKey(user_id=decoded_token['user']['id'], key_type_id=data['key_type_id'], key=data['key'])
-            db.session.add(new_pixkey)
-            db.session.commit()
 
-            return response(status=200, code=200, message='Chave pix adicionada com sucesso.')
+        return response(status=True, code=200, message='Chave pix adicionada com sucesso.')
 
     def _search_pixkey(self, decoded_token) -> jsonify:
-        data = request.json
+        user = search_pixkey(db.session, request.json['pixkey'])
 
-        pixkey = db.session.query(PixKey).filter_by(key=data['pixkey']).first()
+        if not user:
+            return response(status=False, code=404, message='Nenhuma chave pix foi encontrada.')
 
-        if pixkey:
-            user = db.session.query(User).filter_by(id=pixkey.user_id).first()
+        return response(status=True, code=200, message='A solicitação foi concluída com sucesso.', data=user)
 
-            if user:
-                return response(status=True, code=200, message='A solicitação foi concluída com sucesso.', data={'id': user.id, 'username': user.username})
-            else:
-                return response(status=False, code=404, message='Nenhuma chave pix foi encontrada.')
-        else:
-            return response(status=False, code=404, message='Nenhuma chave pix foi encontrada.')
+    def _add_batch(self, decoded_token) -> jsonify:
+        pixkeys = request.json.get('pixkeys')
+
+        if not isinstance(pixkeys, list) or not pixkeys or len(pixkeys) > MAX_BATCH_SIZE:
+            return response(status=False, code=400, message=f'Informe entre 1 e {MAX_BATCH_SIZE} chaves pix.')
+
+        results = add_pixkey_batch(db.session, decoded_token['user']['id'], pixkeys)
+        succeeded = sum(1 for result in results if result['status'] == 'success')
+
+        return response(
+            status=True,
+            code=200,
+            message=f'{succeeded} de {len(results)} chaves pix adicionadas com sucesso.',
+            data={'succeeded': succeeded, 'failed': len(results) - succeeded, 'results': results}
+        )
 
-    def _format_pixkey(self, pixkey) -> dict:
-        return {
-            'id': pixkey.id,
-            'type': db.session.query(PixKeyType).filter_by(id=pixkey.key_type_id).first().description,
-            'key': pixkey.key
-        }
\ No newline at end of file
+    def _resolve_batch(self, decoded_token) -> jsonify:
+        pixkeys = request.json.get('pixkeys')
+
+        if not isinstance(pixkeys, list) or not pixkeys or len(pixkeys) > MAX_BATCH_SIZE or not all(isinstance(key, str) for key in pixkeys):
+            return response(status=False, code=400, message=f'Informe entre 1 e {MAX_BATCH_SIZE} chaves pix.')
+
+        results = resolve_pixkey_batch(db.session, pixkeys)
+        found = sum(1 for result in results if result['user'])
+
+        return response(
+            status=True,
+            code=200,
+            message=f'{found} de {len(results)} chaves pix encontradas.',
+            data={'found': found, 'not_found': len(results) - found, 'results': results}
+        )
@@ -1,36 +1,42 @@
 from config.database import db
-from config.env import env
-from config.response import response
-from flask import Blueprint, request, jsonify
-import jwt
-from models.user_model import User
-from models.transaction_model import Transaction
-from models.transaction_types_model import TransactionTypes
+from config.pagination import InvalidPageRequest, parse_limit
+from config.response import cacheable, response, stream_response
+from blueprints.authenticated_blueprint import AuthenticatedBlueprint
+from flask import current_app, request, jsonify, stream_with_context
+from services.export import ExportError, export_metadata, export_rows
+from services.history import HistoryFilter, current_balance, format_full_transactions, history_page, history_stream, split_history
+from services.idempotency import idempotent
+from services.reference_cache import transaction_types_cache
+from services.transfer import MAX_BATCH_SIZE, TransferError, deposit, transfer, transfer_batch
 from datetime import datetime
 
-class TransactionBlueprint(Blueprint):
+class TransactionBlueprint(AuthenticatedBlueprint):
     def __init__(self) -> None:
         super().__init__('transactionbp', __name__)
 
         @self.route('/get_balance', methods=['GET'])
         def get_balance() -> None:
-            return self._handle_request(self._get_balance)
+            return self._handle_request(self._get_balance, read_only=True)
+
+        @self.route('/get_current_balance', methods=['GET'])
+        def get_current_balance() -> jsonify:
+            return self._handle_request(self._get_current_balance, read_only=True)
 
         @self.route('/deposit', methods=['POST'])
         def deposit() -> None:
-            return self._handle_request(self._deposit)
+            return self._handle_request(idempotent(self._deposit))
 
         @self.route('/get_transactions', methods=['GET'])
         def get_transactions() -> jsonify:
-            return self._handle_request(self._get_transactions)
+            return self._handle_request(self._get_transactions, read_only=True)
         
         @self.route('/get_transaction_types', methods=['GET'])
         def get_transaction_types() -> jsonify:
-            return self._handle_request(self._get_transaction_types)
+            return self._handle_request(self._get_transaction_types, read_only=True)
         
         @self.route('/get_transaction_tax', methods=['GET'])
         def get_transaction_tax() -> jsonify:
-            return self._handle_request(self._get_transaction_tax)
+            return self._handle_request(self._get_transaction_tax, read_only=True)
 
         @self.route('/add_transaction_type', methods=['POST'])
         def add_transaction_type() -> None:
@@ -38,130 +44,127 @@ class TransactionBlueprint(Blueprint):
 
         @self.route('/send_transaction', methods=['POST'])
         def send_transaction() -> jsonify:
-            return self._handle_request(self._send_transaction)
+            return self._handle_request(idempotent(self._send_transaction))
         
+        @self.route('/send_batch', methods=['POST'])
+        def send_batch() -> jsonify:
+            return self._handle_request(idempotent(self._send_batch))
+
+        @self.route('/export', methods=['GET'])
+        def export() -> jsonify:
+            return self._handle_request(self._export, read_only=True)
+
         @self.route('/get_full_transaction', methods=['GET'])
         def get_full_transaction() -> jsonify:
-            return self._handle_request(self._get_full_transaction)
+            return self._handle_request(self._get_full_transaction, read_only=True)
 
-    def _handle_request(self, handler_func) -> jsonify:
+    def _handle_request(self, handler_func, read_only: bool = False) -> jsonify:
         try:
-            token = request.headers.get('Authorization')
-            decoded_token = jwt.decode(jwt=token, key=env('APP_KEY'), options={"verify_signature": False})
-            return handler_func(decoded_token)
-        except jwt.ExpiredSignatureError:
-            return response(status=False, code=401, message='Token expirado.')
-        except jwt.InvalidTokenError:
-            return response(status=False, code=401, message='Token inválido.')
+            return super()._handle_request(handler_func, read_only)
+        except InvalidPageRequest:
+            return response(status=False, code=400, message='Parâmetros de paginação inválidos.')
 
     def _get_balance(self, decoded_token) -> jsonify:
-        user = db.session.query(User).filter_by(id=decoded_token['user']['id']).first()
-        payments = db.session.query(Transaction).filter_by(user_id=decoded_token['user']['id'])
-        received = db.session.query(Transaction).filter_by(user_dest=decoded_token['user']['id'])
+        user_id = decoded_token['user']['id']
+        balance = current_balance(db.session, user_id)
+        transactions, next_cursor = self._history_page(user_id)
 
         return response(
             status=True,
             code=200,
             message='A solicitação foi concluída com sucesso.',
-            data={
-                'balance': user.balance,
-                'payments': [self._format_transaction(p, is_payment=True) for p in payments],
-                'received': [self._format_transaction(r) for r in received]
-            }
+            data={'balance': balance, **split_history(db.session, transactions, user_id)},
+            next_cursor=next_cursor
         )
 
-    def _deposit(self, decoded_token) -> None:
-        data = request.json
-        user_dest = db.session.query(User).filter_by(id=decoded_token['user']['id']).first()
-        amount = data['amount']
-
-        new_transaction = Transaction(
-            user_id=0,
-            user_dest=decoded_token['user']['id'],
-            transaction_type_id=1,
-            amount=amount,
-            description='DEPOSITO'
+    def _get_current_balance(self, decoded_token) -> jsonify:
+        balance = current_balance(db.session, decoded_token['user']['id'])
+
+        if balance is None:
+            return response(status=False, code=404, message='Usuário não encontrado.')
+
+        return response(
+            status=True,
+            code=200,
+            message='A solicitação foi concluída com sucesso.',
+            data={'balance': balance}
         )
 
-        user_dest.balance += amount
+    def _deposit(self, decoded_token) -> None:
+        data = request.json
 
-        db.session.add(new_transaction)
-        db.session.add(user_dest)
-        db.session.commit()
+        try:
+            deposit(db.session, decoded_token['user']['id'], data['amount'])
+        except TransferError as error:
+            return response(status=False, code=error.code, message=error.message)
 
         return response(status=True, code=200, message='Depósito realizado com sucesso.')
 
     def _get_transactions(self, decoded_token) -> jsonify:
-        payments = db.session.query(Transaction).filter_by(user_id=decoded_token['user']['id'])
-        received = db.session.query(Transaction).filter_by(user_dest=decoded_token['user']['id'])
+        user_id = decoded_token['user']['id']
+        transactions, next_cursor = self._history_page(user_id)
 
         return response(
             status=True,
             code=200,
             message='A solicitação foi concluída com sucesso.',
-            data={
-                'payments': [self._format_transaction(p, is_payment=True) for p in payments],
-                'received': [self._format_transaction(r) for r in received]
-            }
+            data=split_history(db.session, transactions, user_id),
+            next_cursor=next_cursor
         )
 
     def _get_transaction_types(self, decoded_token) -> jsonify:
-        transaction_types = db.session.query(TransactionTypes).all()
-        transaction_types_list = [{'id': tt.id, 'description': tt.description, 'tax': tt.tax} for tt in transaction_types]
-        return response(status=True, code=200, message='Tipos de transações obtidos com sucesso', data=transaction_types_list)
+        return cacheable(
+            response(status=True, code=200, message='Tipos de transações obtidos com sucesso', data=transaction_types_cache.all()),
+            etag=transaction_types_cache.etag(),
+            max_age=current_app.config['REFERENCE_CACHE_TTL']
+        )
 
     def _add_transaction_type(self, decoded_token) -> None:
         data = request.json
-
-        new_trans_type = TransactionTypes(
-            description=data['description'],
-            tax=data['tax']
-        )
-
-        db.session.add(new_trans_type)
-        db.session.commit()
+        transaction_types_cache.add(db.session, description=data['description'], tax=data['tax'])
 
         return response(status=True, code=200, message='Tipo de transação adicionado com sucesso.')
 
     def _send_transaction(self, decoded_token) -> jsonify:
         data = request.json
-        user_id = decoded_token['user']['id']
-        user = db.session.query(User).filter_by(id=user_id).first()
-        receiver = db.session.query(User).filter_by(id=data['receiver']).first()
-
-        if not receiver:
-            return response(status=False, code=404, message='Chave PIX do destinatário não encontrada.')
 
-        transaction_type = db.session.query(TransactionTypes).filter_by(id=data['transaction_type']).first()
-
-        if not transaction_type:
-            return response(status=False, code=404, message='Tipo de transação não encontrado.')
+        try:
+            transfer(
+                db.session,
+                sender_id=decoded_token['user']['id'],
+                receiver_id=data['receiver'],
+                amount=data['amount'],
+                transaction_type_id=data['transaction_type']
+            )
+        except TransferError as error:
+            return response(status=False, code=error.code, message=error.message)
 
-        total_amount = data['amount'] * (1 + transaction_type.tax)
+        return response(status=True, code=200, message='Transação realizada com sucesso.')
 
-        if user.balance < total_amount:
-            return response(status=False, code=400, message='Saldo insuficiente.')
+    def _send_batch(self, decoded_token) -> jsonify:
+        transfers = request.json.get('transfers')
 
-        new_transaction = Transaction(
-            user_id=user_id,
-            user_dest=receiver.id,
-            transaction_type_id=data['transaction_type'],
-            amount=total_amount,
-            description='TRANSFERENCIA'
-        )
+        if not isinstance(transfers, list) or not transfers or len(transfers) > MAX_BATCH_SIZE:
+            return response(status=False, code=400, message=f'Informe entre 1 e {MAX_BATCH_SIZE} transferências.')
 
-        user.balance -= total_amount
-        receiver.balance += data['amount'] 
+        try:
+            results = transfer_batch(db.session, decoded_token['user']['id'], transfers)
+        except TransferError as error:
+            return response(status=False, code=error.code, message=error.message)
 
-        db.session.add(new_transaction)
-        db.session.commit()
+        succeeded = sum(1 for result in results if result['status'] == 'success')
 
-        return response(status=True, code=200, message='Transação realizada com sucesso.')
+        return response(
+            status=True,
+            code=200,
+            message=f'{succeeded} de {len(results)} transferências realizadas com sucesso.',
+            data={'succeeded': succeeded, 'failed': len(results) - succeeded, 'results': results}
+        )
 
     def _get_transaction_tax(self, decoded_token) -> jsonify:
         data = request.json
         transaction_type_id = data['transaction_type_id']
-        transaction_type = db.session.query(TransactionTypes).filter_by(id=transaction_type_id).first()
+        transaction_type = transaction_types_cache.get(transaction_type_id)
 
         if not transaction_type:
             return response(status=False, code=404, message='Tipo de transação não encontrado.')
@@ -170,42 +173,61 @@ class TransactionBlueprint(Blueprint):
             status=True,
             code=200,
             message='Taxa de transação obtida com sucesso.',
-            data={'tax': transaction_type.tax}
+            data={'tax': transaction_type['tax']}
         )
 
     def _get_full_transaction(self, decoded_token) -> jsonify:
-        send = db.session.query(Transaction).filter_by(user_id=decoded_token['user']['id'])
-        receive = db.session.query(Transaction).filter_by(user_dest=decoded_token['user']['id'])
+        user_id = decoded_token['user']['id']
+
+        if request.args.get('stream') == 'true':
+            return stream_response(
+                status=True,
+                code=200,
+                message='Detalhes da transação obtidos com sucesso.',
+                rows=self._history_stream(user_id)
+            )
 
-        transactions = send.union(receive).all()
+        transactions, next_cursor = self._history_page(user_id)
 
         if not transactions:
             return response(status=False, code=404, message='Transação não encontrada.')
 
-        formatted_transaction = [{
-            'id': t.id,
-            'type': db.session.query(TransactionTypes).filter_by(id=t.transaction_type_id).first().description,
-            'description': t.description,
-            'amount': t.amount,
-            'datetime': datetime.strftime(t.created_at, "%Y-%m-%d %H:%M:%S"),
-            'receiver': db.session.query(User).filter_by(id=t.user_dest).first().username,
-            'sender': db.session.query(User).filter_by(id=t.user_id).first().username
-        } for t in transactions]
-
         return response(
             status=True,
             code=200,
             message='Detalhes da transação obtidos com sucesso.',
-            data=formatted_transaction
+            data=format_full_transactions(db.session, transactions),
+            next_cursor=next_cursor
+        )
+
+    def _export(self, decoded_token) -> jsonify:
+        export_format = request.args.get('format', 'ndjson')
+        compression = request.args.get('compression', 'none')
+        basename = f'transactions_{datetime.utcnow().strftime("%Y%m%d_%H%M%S")}'
+
+        try:
+            filename, mimetype = export_metadata(export_format, compression, basename)
+        except ExportError as error:
+            return response(status=False, code=400, message=str(error))
+
+        rows = self._history_stream(decoded_token['user']['id'], verify_count=True)
+        chunks = export_rows(rows, export_format, compression, basename, current_app.json.dumps)
+
+        return current_app.response_class(
+            stream_with_context(chunks),
+            status=200,
+            mimetype=mimetype,
+            headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+        )
+
+    def _history_page(self, user_id) -> tuple[list, str | None]:
+        return history_page(
+            db.session,
+            user_id,
+            HistoryFilter.from_args(request.args),
+            request.args.get('cursor'),
+            parse_limit(request.args.get('limit'))
         )
 
-    def _format_transaction(self, transaction, is_payment=False) -> dict:
-        amount = transaction.amount * -1 if is_payment else transaction.amount
-        return {
-            'id': transaction.id,
-            'type': db.session.query(TransactionTypes).filter_by(id=transaction.transaction_type_id).first().description,
-            'description': transaction.description,
-            'amount': amount,
-            'paid_for_received_from': db.session.query(User).filter(User.id==transaction.user_dest if is_payment else User.id==transaction.user_id).first().username,
-            'datetime': datetime.strftime(transaction.created_at, "%Y-%m-%d %H:%M:%S")
-        }
+    def _history_stream(self, user_id, verify_count: bool = False):
+        return history_stream(db.session, user_id, HistoryFilter.from_args(request.args), verify_count)
@@ -1,4 +1,5 @@
 from datetime import datetime
+from decimal import Decimal
 import fire
 from rich.console import Console
 from rich.table import Table
@@ -8,9 +9,10 @@ import getpass
 import json
 import pickle
 import os
-import zipfile
 
 _BASE_URL = 'http://localhost:5000'
+_EXPORT_CHUNK_SIZE = 64 * 1024
+_PAGE_LIMIT = 500
 console = Console()
 
 def _set_password():
@@ -35,7 +37,7 @@ def _save_state(state):
         pickle.dump(state, f)
 
 def _ord_by_date(item):
-    return datetime.strptime(item['datetime'], '%Y-%m-%d %H:%M:%S')
+    return datetime.fromisoformat(item['datetime'])
 
 def _get_default_download_path():
     user_name = os.getlogin()
@@ -132,7 +134,7 @@ class PyGamentos:
                 table.add_column("Pago para / Recebido de", justify="left", style="cyan", no_wrap=True)
                 table.add_column("Horário", justify="left", style="cyan")
 
-                balance = response['data']['balance']
+                balance = Decimal(response['data']['balance'])
                 transactions = sorted(response['data']['payments'] + response['data']['received'], key=_ord_by_date, reverse=True)
 
                 for data in transactions:
@@ -167,7 +169,7 @@ class PyGamentos:
         Descrição:
             Este comando recupera e exibe as Chaves Pix associadas à conta do usuário.
             Se o usuário estiver autenticado, uma tabela será apresentada com as colunas de ID, Tipo e Chave.
-            Cada linha representa uma Chave Pix registrada na conta.
+            Cada linha representa uma Chave Pix registrada na conta. Todas as páginas da listagem são buscadas.
 
         Observação: O usuário deve estar autenticado para utilizar este comando.
 
@@ -176,21 +178,32 @@ class PyGamentos:
         """
         try:
             if self._http.headers['Authorization'] != "":
-                response = self._http.get(f'{_BASE_URL}/pixkey/get_pixkeys')
-                response = json.loads(response.text)
+                pixkeys = []
+                params = {'limit': _PAGE_LIMIT}
 
-                if 'data' not in response:
-                    console.print(f"[red]Erro: {response['message']}[/red]")
-                    return
+                while True:
+                    response = self._http.get(f'{_BASE_URL}/pixkey/get_pixkeys', params=params)
+                    response = json.loads(response.text)
+
+                    if 'data' not in response:
+                        console.print(f"[red]Erro: {response['message']}[/red]")
+                        return
+
+                    pixkeys += response['data']
+
+                    if not response.get('next_cursor'):
+                        break
+
+                    params['cursor'] = response['next_cursor']
 
-                if response['data']:
+                if pixkeys:
                     table = Table(title='Chaves Pix', box=box.SIMPLE_HEAVY, show_lines=True, header_style="bold magenta")
 
                     table.add_column("ID", justify="left", style="cyan", no_wrap=True)
                     table.add_column("Tipo", justify="left", style="cyan", no_wrap=True)
                     table.add_column("Chave", justify="right", style="cyan")
 
-                    for data in response['data']:
+                    for data in pixkeys:
                         table.add_row(str(data['id']), data['type'], data['key'])
 
                     console.print(table)
@@ -294,7 +307,7 @@ class PyGamentos:
                             console.print('Selecione um cartão de crédito:\n')
 
                             for card in credit_cards:
-                                console.print(f'{card["id"]}. **** **** **** {card["number"][-4:]} {card["description"]}')
+                                console.print(f'{card["id"]}. **** **** **** {card["last4"]} {card["description"]}')
 
                             card_id = int(input("... "))
                             selected_card = next((card for card in credit_cards if card["id"] == card_id), None)
@@ -306,16 +319,17 @@ class PyGamentos:
                             transaction_tax = self._http.get(f'{_BASE_URL}/transaction/get_transaction_tax', json={'transaction_type_id': transaction_type})
                             transaction_tax = json.loads(transaction_tax.text)
 
-                            total_amount_with_tax = amount * (1 + transaction_tax['data']['tax'])
+                            tax = Decimal(transaction_tax['data']['tax'])
+                            total_amount_with_tax = Decimal(str(amount)) * (1 + tax)
                             total_amount_with_tax_str = f'R$ {total_amount_with_tax:.2f}'
 
                             console.print(f'\nDetalhes da transferência:')
-                            console.print(f'Taxa por crédito: {transaction_tax["data"]["tax"] * 100}%')
+                            console.print(f'Taxa por crédito: {tax * 100:.2f}%')
                             console.print(f'Destinatário: {check_pixkey["data"]["username"]}')
                             console.print(f'Valor da transferência: {total_amount_with_tax_str}\n')
 
 
-                            confirmation = input(f'Tem certeza que deseja transferir para @{check_pixkey["data"]["username"]} usando o cartão de crédito terminado em **** {selected_card["number"][-4:]} {selected_card["description"]}? (S/n)... ')
+                            confirmation = input(f'Tem certeza que deseja transferir para @{check_pixkey["data"]["username"]} usando o cartão de crédito terminado em **** {selected_card["last4"]} {selected_card["description"]}? (S/n)... ')
                             if confirmation.lower() == 's':
                                 response = self._http.post(f'{_BASE_URL}/transaction/send_transaction', json={'receiver': check_pixkey['data']['id'], 'amount': amount, 'transaction_type': transaction_type, 'credit_card_id': selected_card['id']})
                                 response = json.loads(response.text)
@@ -421,7 +435,7 @@ class PyGamentos:
                     table.add_column("Descrição", justify="left")
 
                     for card in credit_cards:
-                        table.add_row(str(card['id']), f"**** **** **** {card['number'][-4:]}", card['description'])
+                        table.add_row(str(card['id']), f"**** **** **** {card['last4']}", card['description'])
 
                     console.print(table)
 
@@ -434,36 +448,48 @@ class PyGamentos:
         except Exception as e:
             console.print(f"[red]Erro ao listar cartões de crédito: {e}[/red]")
 
-    def export_transactions(self) -> None:
+    def export_transactions(self, format='ndjson', compression='zip', start_date=None, end_date=None) -> None:
         
-        """Exporta dados das transações do usuário.
+        """Exporta dados das transações do usuário. PARAMS: [--format] [--compression] [--start_date] [--end_date]
 
             Sintaxe:
-                pygamentos export_transactions
+                pygamentos export_transactions [--format=ndjson|csv|parquet] [--compression=zip|gzip|none]
+                                               [--start_date=AAAA-MM-DD] [--end_date=AAAA-MM-DD]
 
             Descrição:
-                Este comando permite ao usuário exportar dados completos das suas transações para um arquivo JSON.
+                Este comando permite ao usuário exportar dados completos das suas transações em NDJSON, CSV ou Parquet,
+                opcionalmente compactados em zip ou gzip e filtrados por período. O servidor gera o arquivo sob demanda
+                e ele é gravado em disco em blocos, à medida que é recebido, sem ser mantido em memória.
                 Após a exportação, o arquivo é salvo no diretório padrão de downloads do sistema, e o nome do arquivo
                 contém a data e hora da exportação para garantir a unicidade dos arquivos.
 
             Exemplo:
                 pygamentos export_transactions
+                pygamentos export_transactions --format=csv --compression=gzip --start_date=2023-01-01
         """
         try:
 
             if self._http.headers['Authorization'] != "":
                 console.print("Exportando dados...")
-                response = self._http.get(f'{_BASE_URL}/transaction/get_full_transaction')
-                response = json.loads(response.text)
+                params = {'format': format, 'compression': compression}
 
-                if response['code'] == 200:
-                    zip_file_path = os.path.join(_get_default_download_path(), f'transaction_{datetime.now().strftime("%Y-%M-%d_%H-%M-%S")}.zip')
-                    with zipfile.ZipFile(zip_file_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                        zipf.writestr('transaction_data.json', json.dumps(response['data']))
-                        
-                    console.print(f"Exportado com sucesso para {_get_default_download_path()}")
-                else:
-                    console.print(f"[red]Erro ao exportar lista de transações.")
+                if start_date:
+                    params['start_date'] = str(start_date)
+                if end_date:
+                    params['end_date'] = str(end_date)
+
+                with self._http.get(f'{_BASE_URL}/transaction/export', params=params, stream=True) as response:
+                    if response.status_code == 200:
+                        filename = response.headers.get('Content-Disposition', '').split('filename=')[-1].strip('"')
+                        file_path = os.path.join(_get_default_download_path(), filename or f'transaction_{datetime.now().strftime("%Y-%m-%d_%H-%M-%S")}')
+
+                        with open(file_path, 'wb') as f:
+                            for chunk in response.iter_content(chunk_size=_EXPORT_CHUNK_SIZE):
+                                f.write(chunk)
+
+                        console.print(f"Exportado com sucesso para {file_path}")
+                    else:
+                        console.print(f"[red]Erro ao exportar lista de transações: {json.loads(response.text)['message']}[/red]")
             else:
                 console.print("Faça login primeiro.")
 
@@ -0,0 +1,11 @@
+from flask.cli import AppGroup
+from services.idempotency import purge_expired
+import click
+
+idempotency_cli = AppGroup('idempotency', help='Manutenção das chaves de idempotência.')
+
+@idempotency_cli.command('purge')
+def purge() -> None:
+    """Remove as chaves de idempotência expiradas."""
+    total = purge_expired()
+    click.echo(f'{total} chaves expiradas removidas.')
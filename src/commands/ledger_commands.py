@@ -0,0 +1,28 @@
+from datetime import timedelta
+from flask import current_app
+from flask.cli import AppGroup
+from services.ledger import audit_balances, take_snapshots
+import click
+
+ledger_cli = AppGroup('ledger', help='Snapshots e auditoria de saldos.')
+
+@ledger_cli.command('snapshot')
+def snapshot() -> None:
+    """Registra o saldo de cada usuário na última posição estável do ledger."""
+    total = take_snapshots(timedelta(seconds=current_app.config['LEDGER_SNAPSHOT_GRACE']))
+    click.echo(f'{total} snapshots registrados.')
+
+@ledger_cli.command('audit')
+@click.argument('user_ids', nargs=-1, type=int)
+def audit(user_ids) -> None:
+    """Compara o saldo dos usuários com o ledger a partir do último snapshot."""
+    results = audit_balances(list(user_ids) or None)
+    inconsistent = [r for r in results if not r['consistent']]
+
+    for result in inconsistent:
+        click.echo(f"Usuário {result['user_id']}: saldo {result['balance']} / ledger {result['ledger_balance']}")
+
+    click.echo(f'{len(results)} saldos auditados, {len(inconsistent)} divergentes.')
+
+    if inconsistent:
+        raise SystemExit(1)
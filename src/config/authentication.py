@@ -0,0 +1,84 @@
+from collections import OrderedDict
+from config.passwords import PasswordHasher
+from config.rate_limit import TokenBucketLimiter
+from config.response import response
+from flask import Flask, current_app, g, request
+from threading import Lock
+import hashlib
+import jwt
+import time
+
+JWT_ALGORITHMS = ['HS256']
+
+class TokenCache:
+    def __init__(self, max_size: int) -> None:
+        self._max_size = max_size
+        self._entries: OrderedDict[bytes, tuple[dict, float]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, cache_key: bytes) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(cache_key)
+
+            if entry is None:
+                return None
+
+            payload, expires_at = entry
+
+            if expires_at <= time.time():
+                del self._entries[cache_key]
+                return None
+
+            self._entries.move_to_end(cache_key)
+            return payload
+
+    def put(self, cache_key: bytes, payload: dict, expires_at: float) -> None:
+        if self._max_size <= 0:
+            return
+
+        with self._lock:
+            self._entries[cache_key] = (payload, expires_at)
+            self._entries.move_to_end(cache_key)
+
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+def _cache_key(token: str, app_key: str) -> bytes:
+    # A chave da aplicação entra no hash para que tokens verificados com uma
+    # APP_KEY anterior deixem de valer após uma recarga das configurações.
+    return hashlib.sha256(f'{app_key}.{token}'.encode()).digest()
+
+def decode_token(token: str | None, app_key: str, cache: TokenCache) -> dict:
+    if not token:
+        raise jwt.InvalidTokenError('Token ausente.')
+
+    cache_key = _cache_key(token, app_key)
+    payload = cache.get(cache_key)
+
+    if payload is None:
+        payload = jwt.decode(token, app_key, algorithms=JWT_ALGORITHMS, options={'require': ['exp']})
+        cache.put(cache_key, payload, payload['exp'])
+
+    return payload
+
+def verify_token(token: str | None) -> dict:
+    return decode_token(token, current_app.config['APP_KEY'], current_app.extensions['token_cache'])
+
+def authenticate():
+    try:
+        g.decoded_token = verify_token(request.headers.get('Authorization'))
+    except jwt.ExpiredSignatureError:
+        return response(status=False, code=401, message='Token expirado.')
+    except jwt.InvalidTokenError:
+        return response(status=False, code=401, message='Token inválido.')
+
+def init_authentication(app: Flask) -> TokenCache:
+    cache = TokenCache(app.config['TOKEN_CACHE_SIZE'])
+    app.extensions['token_cache'] = cache
+    app.extensions['password_hasher'] = PasswordHasher(app.config)
+    app.extensions['login_limiter'] = TokenBucketLimiter()
+    return cache
@@ -1,3 +1,102 @@
+from collections import OrderedDict
+from config.settings import REPLICA_BIND_PREFIX
+from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, orm
+from threading import Lock
+import random
+import time
 
-db = SQLAlchemy()
\ No newline at end of file
+REPLICA_INFO_KEY = 'replica'
+WROTE_INFO_KEY = 'wrote'
+DEFERRED_COMMIT_INFO_KEY = 'deferred_commit'
+READ_YOUR_WRITES_COOKIE = 'primary_until'
+
+class ReplicaRoutingMixin:
+    # Leituras (SELECT fora de um flush) vão para a réplica escolhida para a
+    # requisição; escritas e sessões sem réplica seguem para o primário.
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        replica = self.info.get(REPLICA_INFO_KEY)
+
+        if replica is not None and bind is None and not self._flushing and getattr(clause, 'is_select', False):
+            return replica
+
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+class RoutingSession(ReplicaRoutingMixin, Session):
+    pass
+
+class AsyncRoutingSession(ReplicaRoutingMixin, orm.Session):
+    pass
+
+def _flushed(session, flush_context) -> None:
+    session.info[WROTE_INFO_KEY] = True
+
+def _executed(orm_execute_state) -> None:
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info[WROTE_INFO_KEY] = True
+
+for session_class in (RoutingSession, AsyncRoutingSession):
+    event.listen(session_class, 'after_flush', _flushed)
+    event.listen(session_class, 'do_orm_execute', _executed)
+
+class ReplicaRouter:
+    def __init__(self, engines: list, max_users: int = 100000) -> None:
+        self._engines = engines
+        self._max_users = max_users
+        self._written: OrderedDict[int, float] = OrderedDict()
+        self._lock = Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._engines)
+
+    def mark_write(self, user_id: int, window: int) -> float:
+        until = time.time() + window
+
+        with self._lock:
+            self._written[user_id] = until
+            self._written.move_to_end(user_id)
+
+            while len(self._written) > self._max_users:
+                self._written.popitem(last=False)
+
+        return until
+
+    def is_sticky(self, user_id: int) -> bool:
+        with self._lock:
+            until = self._written.get(user_id)
+
+            if until is None:
+                return False
+
+            if until <= time.time():
+                del self._written[user_id]
+                return False
+
+            return True
+
+    def choose(self, user_id: int, primary_until: str | None = None):
+        # Depois de uma escrita o usuário lê do primário até o fim da janela. O
+        # registro em memória vale para este processo; o cookie cobre os demais.
+        if not self._engines or self.is_sticky(user_id):
+            return None
+
+        try:
+            if float(primary_until or 0) > time.time():
+                return None
+        except ValueError:
+            pass
+
+        return random.choice(self._engines)
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+def init_replicas(app: Flask) -> ReplicaRouter:
+    with app.app_context():
+        engines = [engine for key, engine in db.engines.items() if key and key.startswith(REPLICA_BIND_PREFIX)]
+
+    router = ReplicaRouter(engines)
+    app.extensions['replica_router'] = router
+    return router
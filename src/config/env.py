@@ -1,14 +1,21 @@
-from dotenv import load_dotenv
+from dotenv import dotenv_values
 import os
 
-def env(var_name: str) -> str:
-    load_dotenv(
-        dotenv_path=os.path.join(
-            os.path.dirname(
-                os.path.dirname(
-                   os.path.dirname(__file__)
-                )
-            ), ".env"
+_DOTENV_PATH = os.path.join(
+    os.path.dirname(
+        os.path.dirname(
+           os.path.dirname(__file__)
         )
-    )
-    return os.getenv(var_name)
\ No newline at end of file
+    ), ".env"
+)
+_values: dict[str, str] | None = None
+
+def load_env() -> dict[str, str]:
+    global _values
+    # Variáveis de ambiente reais têm precedência sobre o arquivo .env.
+    _values = {**dotenv_values(_DOTENV_PATH), **os.environ}
+    return _values
+
+def env(var_name: str) -> str:
+    values = _values if _values is not None else load_env()
+    return values.get(var_name)
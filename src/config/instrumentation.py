@@ -0,0 +1,272 @@
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from flask import Flask, current_app, g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from threading import Lock
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator
+import hmac
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+METRICS_PREFIX = 'pygamentos'
+METRICS_MIMETYPE = 'text/plain; version=0.0.4'
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 250)
+
+@dataclass
+class RequestStats:
+    started: float = field(default_factory=time.perf_counter)
+    statements: int = 0
+    db_time: float = 0.0
+    rows: int = 0
+    response_bytes: int = 0
+
+    @property
+    def wall_time(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        return (
+            f'app;dur={self.wall_time * 1000:.1f}, '
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.statements} statements"'
+        )
+
+# As estatísticas da requisição ficam em um ContextVar: vale para threads do
+# gunicorn e para tasks/greenlets da variante assíncrona.
+current_stats: ContextVar[RequestStats | None] = ContextVar('request_stats', default=None)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if current_stats.get() is not None:
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+def _finish_statement(conn, cursor) -> None:
+    # A entrada é removida mesmo sem estatísticas ativas: uma sobra na pilha
+    # deslocaria a medição dos próximos comandos da conexão.
+    started = conn.info.get('query_started')
+
+    if not started:
+        return
+
+    elapsed = time.perf_counter() - started.pop()
+    stats = current_stats.get()
+
+    if stats is None:
+        return
+
+    stats.db_time += elapsed
+    stats.statements += 1
+
+    # Linhas informadas pelo driver: o PyMySQL reporta SELECTs e DMLs; o SQLite
+    # só DMLs, e cursores no servidor (streaming) não reportam.
+    if cursor is not None and cursor.rowcount and cursor.rowcount > 0:
+        stats.rows += cursor.rowcount
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    _finish_statement(conn, cursor)
+
+def _handle_error(exception_context) -> None:
+    # Comandos que falham não passam pelo after_cursor_execute. O evento não pode
+    # levantar exceções: isso substituiria o erro original (IntegrityError,
+    # OperationalError) que os serviços tratam.
+    connection = exception_context.connection
+
+    if connection is None or exception_context.execution_context is None:
+        return
+
+    try:
+        _finish_statement(connection, None)
+    except Exception:
+        logger.exception('Falha ao registrar o tempo de um comando SQL com erro.')
+
+event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+event.listen(Engine, 'handle_error', _handle_error)
+
+class _Histogram:
+    def __init__(self, buckets: tuple) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+
+        self.total += 1
+        self.sum += value
+
+class Metrics:
+    COUNTERS = (
+        ('requests_total', 'Requisições atendidas.'),
+        ('db_duration_seconds_total', 'Tempo gasto em comandos SQL.'),
+        ('db_statements_total', 'Comandos SQL executados.'),
+        ('db_rows_total', 'Linhas retornadas ou afetadas, segundo o driver.'),
+        ('response_bytes_total', 'Bytes enviados no corpo das respostas.'),
+        ('statement_budget_exceeded_total', 'Requisições acima do limite de comandos SQL.')
+    )
+    HISTOGRAMS = (
+        ('request_duration_seconds', 'Tempo total da requisição.', DURATION_BUCKETS),
+        ('db_statements_per_request', 'Comandos SQL por requisição.', STATEMENT_BUCKETS)
+    )
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._counters: dict[str, dict[tuple, float]] = {name: {} for name, _ in self.COUNTERS}
+        self._histograms: dict[str, dict[tuple, _Histogram]] = {name: {} for name, _, _ in self.HISTOGRAMS}
+
+    def _add(self, name: str, labels: tuple, value: float) -> None:
+        self._counters[name][labels] = self._counters[name].get(labels, 0) + value
+
+    def _observe(self, name: str, buckets: tuple, labels: tuple, value: float) -> None:
+        self._histograms[name].setdefault(labels, _Histogram(buckets)).observe(value)
+
+    def observe(self, endpoint: str, method: str, status: int, stats: RequestStats, budget: int) -> None:
+        labels = (('endpoint', endpoint),)
+        wall_time = stats.wall_time
+
+        with self._lock:
+            self._add('requests_total', labels + (('method', method), ('status', str(status))), 1)
+            self._add('db_duration_seconds_total', labels, stats.db_time)
+            self._add('db_statements_total', labels, stats.statements)
+            self._add('db_rows_total', labels, stats.rows)
+            self._add('response_bytes_total', labels, stats.response_bytes)
+            self._observe('request_duration_seconds', DURATION_BUCKETS, labels, wall_time)
+            self._observe('db_statements_per_request', STATEMENT_BUCKETS, labels, stats.statements)
+
+            if stats.statements > budget:
+                self._add('statement_budget_exceeded_total', labels, 1)
+
+        if stats.statements > budget:
+            logger.warning(
+                f'{method} {endpoint}: {stats.statements} comandos SQL (limite {budget}), '
+                f'{stats.db_time * 1000:.1f} ms no banco de {wall_time * 1000:.1f} ms.'
+            )
+
+    def render(self) -> str:
+        lines = []
+
+        with self._lock:
+            for name, help_text in self.COUNTERS:
+                lines.append(f'# HELP {METRICS_PREFIX}_{name} {help_text}')
+                lines.append(f'# TYPE {METRICS_PREFIX}_{name} counter')
+
+                for labels, value in sorted(self._counters[name].items()):
+                    lines.append(f'{METRICS_PREFIX}_{name}{{{_labels(labels)}}} {value:g}')
+
+            for name, help_text, _ in self.HISTOGRAMS:
+                lines.append(f'# HELP {METRICS_PREFIX}_{name} {help_text}')
+                lines.append(f'# TYPE {METRICS_PREFIX}_{name} histogram')
+
+                for labels, histogram in sorted(self._histograms[name].items()):
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        lines.append(f'{METRICS_PREFIX}_{name}_bucket{{{_labels(labels + (("le", f"{bound:g}"),))}}} {count}')
+
+                    lines.append(f'{METRICS_PREFIX}_{name}_bucket{{{_labels(labels + (("le", "+Inf"),))}}} {histogram.total}')
+                    lines.append(f'{METRICS_PREFIX}_{name}_sum{{{_labels(labels)}}} {histogram.sum:g}')
+                    lines.append(f'{METRICS_PREFIX}_{name}_count{{{_labels(labels)}}} {histogram.total}')
+
+        return '\n'.join(lines) + '\n'
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(labels: tuple) -> str:
+    return ','.join(f'{key}="{_escape(value)}"' for key, value in labels)
+
+def _size(chunk) -> int:
+    return len(chunk.encode() if isinstance(chunk, str) else chunk)
+
+def count_bytes(chunks: Iterable, stats: RequestStats, finish) -> Iterator:
+    # Respostas em streaming só são registradas quando o último bloco é enviado;
+    # as consultas feitas durante o envio também contam para a requisição.
+    current_stats.set(stats)
+
+    try:
+        for chunk in chunks:
+            stats.response_bytes += _size(chunk)
+            yield chunk
+    finally:
+        finish()
+
+async def count_bytes_async(chunks: AsyncIterable, stats: RequestStats, finish) -> AsyncIterator:
+    current_stats.set(stats)
+
+    try:
+        async for chunk in chunks:
+            stats.response_bytes += _size(chunk)
+            yield chunk
+    finally:
+        finish()
+
+def start_request() -> RequestStats:
+    stats = RequestStats()
+    current_stats.set(stats)
+    return stats
+
+def finish_request(stats: RequestStats, metrics: Metrics, endpoint: str | None, method: str, status: int, budget: int):
+    def finish() -> None:
+        metrics.observe(endpoint or 'unmatched', method, status, stats, budget)
+        current_stats.set(None)
+
+    return finish
+
+def _start() -> None:
+    if current_app.config['INSTRUMENTATION']:
+        g.request_stats = start_request()
+
+def _finish(response):
+    stats = g.pop('request_stats', None)
+
+    if stats is None:
+        return response
+
+    finish = finish_request(
+        stats,
+        current_app.extensions['metrics'],
+        request.endpoint,
+        request.method,
+        response.status_code,
+        current_app.config['STATEMENT_BUDGET']
+    )
+    response.headers['Server-Timing'] = stats.server_timing()
+
+    if response.is_streamed:
+        response.response = count_bytes(response.response, stats, finish)
+    else:
+        stats.response_bytes = response.content_length or 0
+        finish()
+
+    return response
+
+def metrics_error(config, authorization: str | None) -> tuple[int, str] | None:
+    # O /metrics expõe nomes de endpoints e volumes de tráfego: só responde com
+    # a instrumentação ligada e a METRICS_TOKEN no cabeçalho Authorization.
+    if not config['INSTRUMENTATION'] or not config['METRICS_TOKEN']:
+        return 404, 'Instrumentação desativada.\n'
+
+    if not hmac.compare_digest((authorization or '').encode(), f'Bearer {config["METRICS_TOKEN"]}'.encode()):
+        return 401, 'Não autorizado.\n'
+
+    return None
+
+def _metrics_view():
+    error = metrics_error(current_app.config, request.headers.get('Authorization'))
+
+    if error:
+        status, message = error
+        return current_app.response_class(message, status=status, mimetype='text/plain')
+
+    return current_app.response_class(current_app.extensions['metrics'].render(), mimetype=METRICS_MIMETYPE)
+
+def init_instrumentation(app: Flask) -> Metrics:
+    metrics = Metrics()
+    app.extensions['metrics'] = metrics
+    app.before_request(_start)
+    app.after_request(_finish)
+    app.add_url_rule('/metrics', 'metrics', _metrics_view)
+    return metrics
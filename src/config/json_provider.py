@@ -0,0 +1,70 @@
+from dataclasses import asdict, is_dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Valores Decimal (saldos, valores e taxas) são sempre serializados como string
+# em notação fixa ("10.50", "0.0150"): o tipo do campo não depende do valor e
+# nenhum cliente perde precisão ao convertê-lo para float.
+def _decimal(o: Decimal) -> str:
+    return format(o, 'f')
+
+def _default(o):
+    if isinstance(o, Decimal):
+        return _decimal(o)
+
+    if isinstance(o, datetime):
+        return o.isoformat(timespec='seconds')
+
+    if isinstance(o, date):
+        return o.isoformat()
+
+    if is_dataclass(o) and not isinstance(o, type):
+        return asdict(o)
+
+    return DefaultJSONProvider.default(o)
+
+def _orjson_default(o):
+    if isinstance(o, Decimal):
+        return _decimal(o)
+
+    raise TypeError(f'Object of type {type(o).__name__} is not JSON serializable')
+
+class MoneyJSONProvider(DefaultJSONProvider):
+    default = staticmethod(_default)
+    sort_keys = False
+
+    def loads(self, s, **kwargs):
+        kwargs.setdefault('parse_float', Decimal)
+        return super().loads(s, **kwargs)
+
+class OrjsonJSONProvider(MoneyJSONProvider):
+    # datetime, date e dataclasses são serializados nativamente pelo orjson, em
+    # ISO 8601 sem microssegundos, como no MoneyJSONProvider.
+    options = orjson.OPT_OMIT_MICROSECONDS | orjson.OPT_NON_STR_KEYS if orjson else 0
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=_orjson_default, option=self.options).decode()
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=_orjson_default, option=self.options | orjson.OPT_APPEND_NEWLINE),
+            mimetype=self.mimetype
+        )
+
+def create_json_provider(app: Flask, name: str = 'auto') -> DefaultJSONProvider:
+    if name == 'orjson' and orjson is None:
+        raise RuntimeError('JSON_PROVIDER=orjson, mas o pacote orjson não está instalado.')
+
+    if name in ('auto', 'orjson') and orjson is not None:
+        return OrjsonJSONProvider(app)
+
+    return MoneyJSONProvider(app)
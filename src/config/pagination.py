@@ -0,0 +1,74 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as DecodeError
+from datetime import datetime
+from sqlalchemy import and_, or_
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+class InvalidPageRequest(ValueError):
+    pass
+
+def parse_limit(value: str | None) -> int:
+    if value is None:
+        return DEFAULT_LIMIT
+
+    try:
+        limit = int(value)
+    except ValueError:
+        raise InvalidPageRequest('limit')
+
+    if limit < 1:
+        raise InvalidPageRequest('limit')
+
+    return min(limit, MAX_LIMIT)
+
+def parse_datetime(value: str | None) -> datetime | None:
+    if value is None:
+        return None
+
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise InvalidPageRequest(value)
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    return urlsafe_b64encode(f'{created_at.isoformat()}|{row_id}'.encode()).decode()
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created_at, row_id = urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (DecodeError, UnicodeDecodeError, ValueError):
+        raise InvalidPageRequest('cursor')
+
+def keyset_page(queries, created_at_column, id_column, cursor: str | None, limit: int) -> tuple[list, str | None]:
+    # Cada consulta lê no máximo `limit + 1` linhas a partir do cursor, então o custo
+    # de uma página não depende da sua profundidade.
+    position = decode_cursor(cursor) if cursor else None
+    rows = {}
+
+    for query in queries:
+        if position:
+            created_at, row_id = position
+            query = query.filter(or_(
+                created_at_column < created_at,
+                and_(created_at_column == created_at, id_column < row_id)
+            ))
+
+        for row in query.order_by(created_at_column.desc(), id_column.desc()).limit(limit + 1):
+            rows[getattr(row, id_column.key)] = row
+
+    ordered = sorted(
+        rows.values(),
+        key=lambda row: (getattr(row, created_at_column.key), getattr(row, id_column.key)),
+        reverse=True
+    )
+    page = ordered[:limit]
+    next_cursor = None
+
+    if len(ordered) > limit:
+        last = page[-1]
+        next_cursor = encode_cursor(getattr(last, created_at_column.key), getattr(last, id_column.key))
+
+    return page, next_cursor
@@ -0,0 +1,63 @@
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from threading import Lock
+from werkzeug.security import check_password_hash, generate_password_hash
+import secrets
+
+PASSWORD_METHOD = 'pbkdf2:sha256'
+
+class HashingBusy(RuntimeError):
+    pass
+
+class PasswordHasher:
+    # O PBKDF2 libera o GIL: o pool limita quantas derivações rodam ao mesmo
+    # tempo no processo e as demais esperam na fila. Só limita a concorrência:
+    # a thread da requisição fica bloqueada em `future.result` até o fim do
+    # hash ou do PASSWORD_HASH_TIMEOUT. O custo e o tempo de espera são lidos
+    # da configuração a cada chamada e acompanham recargas.
+    def __init__(self, config) -> None:
+        self._config = config
+        self._executor = ThreadPoolExecutor(max_workers=config['PASSWORD_HASH_WORKERS'], thread_name_prefix='password-hasher')
+        self._dummies: dict[str, str] = {}
+        self._lock = Lock()
+
+    @property
+    def method(self) -> str:
+        return f'{PASSWORD_METHOD}:{self._config["PASSWORD_HASH_ITERATIONS"]}'
+
+    def _run(self, function, *args):
+        future = self._executor.submit(function, *args)
+
+        try:
+            return future.result(timeout=self._config['PASSWORD_HASH_TIMEOUT'])
+        except TimeoutError:
+            future.cancel()
+            raise HashingBusy()
+
+    def hash(self, password: str) -> str:
+        return self._run(generate_password_hash, password, self.method)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        return not password_hash.startswith(f'{self.method}$')
+
+    def _dummy(self) -> str:
+        method = self.method
+
+        with self._lock:
+            dummy = self._dummies.get(method)
+
+        if dummy is None:
+            dummy = self.hash(secrets.token_urlsafe())
+
+            with self._lock:
+                self._dummies[method] = dummy
+
+        return dummy
+
+    def verify(self, password_hash: str | None, password: str) -> bool:
+        # Usuários inexistentes são comparados com um hash descartável de mesmo
+        # custo, para que o tempo de resposta não revele quais usuários existem.
+        if password_hash is None:
+            self._run(check_password_hash, self._dummy(), password)
+            return False
+
+        return self._run(check_password_hash, password_hash, password)
@@ -0,0 +1,40 @@
+from collections import OrderedDict
+from threading import Lock
+import time
+
+class TokenBucketLimiter:
+    def __init__(self, max_keys: int = 100000) -> None:
+        self._max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = Lock()
+
+    def acquire(self, key: str, burst: int, per_minute: int) -> float:
+        # Retorna 0 quando a tentativa é aceita ou, caso contrário, quantos
+        # segundos faltam para o próximo token. `per_minute` 0 desativa o limite.
+        if per_minute <= 0:
+            return 0.0
+
+        rate = per_minute / 60
+        now = time.monotonic()
+
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / rate
+
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+
+            while len(self._buckets) > self._max_keys:
+                self._buckets.popitem(last=False)
+
+        return wait
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
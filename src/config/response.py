@@ -1,16 +1,71 @@
-from flask import jsonify
+from flask import current_app, jsonify, request, stream_with_context
+from typing import Callable, Iterable, Iterator
 
-def response(
+STREAM_BATCH_SIZE = 1000
+
+def envelope(
     status: bool,
     code: int,
     message: str,
     error: Exception | None = None,
-    data: list[dict] | None = None
-) -> jsonify:
-    return jsonify({
+    data: list[dict] | None = None,
+    next_cursor: str | None = None
+) -> dict:
+    return {
         'status': 'success' if status else 'error',
         'code': code,
         'message': message,
         'error': error,
-        'data': data
-    }), code
\ No newline at end of file
+        'data': data,
+        'next_cursor': next_cursor
+    }
+
+def response(
+    status: bool,
+    code: int,
+    message: str,
+    error: Exception | None = None,
+    data: list[dict] | None = None,
+    next_cursor: str | None = None
+) -> jsonify:
+    return jsonify(envelope(status, code, message, error, data, next_cursor)), code
+
+def cacheable(result: tuple, etag: str, max_age: int) -> jsonify:
+    flask_response, code = result
+    flask_response.status_code = code
+    flask_response.set_etag(etag)
+    flask_response.cache_control.private = True
+    flask_response.cache_control.max_age = max_age
+    return flask_response.make_conditional(request)
+
+def stream_chunks(dumps: Callable, status: bool, code: int, message: str, rows: Iterable[dict]) -> Iterator[str]:
+    head = envelope(status, code, message)
+    del head['data']
+
+    # O envelope é escrito antes dos dados e cada lote de linhas é serializado e
+    # enviado assim que lido, mantendo a memória constante.
+    yield dumps(head)[:-1] + ',"data":['
+    batch = []
+    separator = ''
+
+    for row in rows:
+        batch.append(dumps(row))
+
+        if len(batch) == STREAM_BATCH_SIZE:
+            yield separator + ','.join(batch)
+            separator = ','
+            batch = []
+
+    if batch:
+        yield separator + ','.join(batch)
+
+    yield ']}'
+
+def stream_response(
+    status: bool,
+    code: int,
+    message: str,
+    rows: Iterable[dict]
+) -> jsonify:
+    chunks = stream_chunks(current_app.json.dumps, status, code, message, rows)
+    return current_app.response_class(stream_with_context(chunks), status=code, mimetype='application/json')
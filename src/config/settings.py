@@ -0,0 +1,226 @@
+from config.env import env, load_env
+from dataclasses import dataclass, field
+from flask import Flask
+import logging
+import os
+import signal
+
+logger = logging.getLogger(__name__)
+
+# O engine, o pool de hashing e o ProxyFix são criados uma única vez; só mudam ao reiniciar.
+# A VAULT_KEY não é trocada a quente: os cartões já gravados deixariam de abrir.
+RESTART_ONLY = ('SQLALCHEMY_DATABASE_URI', 'SQLALCHEMY_ENGINE_OPTIONS', 'SQLALCHEMY_BINDS', 'PASSWORD_HASH_WORKERS', 'TRUSTED_PROXIES', 'VAULT_KEY')
+REPLICA_BIND_PREFIX = 'replica_'
+
+class SettingsError(ValueError):
+    pass
+
+def _int(name: str, default: int, minimum: int = 0) -> int:
+    value = env(name)
+
+    if value in (None, ''):
+        return default
+
+    try:
+        parsed = int(value)
+    except ValueError:
+        raise SettingsError(f'{name} deve ser um número inteiro.')
+
+    if parsed < minimum:
+        raise SettingsError(f'{name} deve ser maior ou igual a {minimum}.')
+
+    return parsed
+
+def _choice(name: str, default: str, choices: tuple[str, ...]) -> str:
+    value = env(name) or default
+
+    if value not in choices:
+        raise SettingsError(f'{name} deve ser um destes valores: {", ".join(choices)}.')
+
+    return value
+
+def _bool(name: str, default: bool) -> bool:
+    value = env(name)
+
+    if value in (None, ''):
+        return default
+
+    if value.lower() not in ('true', 'false', '1', '0'):
+        raise SettingsError(f'{name} deve ser true ou false.')
+
+    return value.lower() in ('true', '1')
+
+def _list(name: str) -> tuple[str, ...]:
+    return tuple(item.strip() for item in (env(name) or '').split(',') if item.strip())
+
+def _secret(name: str, min_length: int) -> str:
+    value = env(name) or ''
+
+    if value and len(value) < min_length:
+        raise SettingsError(f'{name} deve ter pelo menos {min_length} caracteres.')
+
+    return value
+
+def _required(name: str) -> str:
+    value = env(name)
+
+    if not value:
+        raise SettingsError(f'{name} não foi configurada.')
+
+    return value
+
+@dataclass(frozen=True)
+class Settings:
+    app_key: str = field(repr=False)
+    sqlalchemy_database_uri: str
+    idempotency_ttl: int
+    idempotency_lease: int
+    token_cache_size: int
+    reference_cache_ttl: int
+    reference_negative_cache_ttl: int
+    json_provider: str
+    db_pool_size: int
+    db_max_overflow: int
+    db_pool_timeout: int
+    db_pool_recycle: int
+    db_pool_pre_ping: bool
+    sqlalchemy_replica_uris: tuple[str, ...] = field(repr=False)
+    read_your_writes_window: int
+    instrumentation: bool
+    statement_budget: int
+    metrics_token: str = field(repr=False)
+    password_hash_iterations: int
+    password_hash_workers: int
+    password_hash_timeout: int
+    login_user_burst: int
+    login_user_per_minute: int
+    login_ip_burst: int
+    login_ip_per_minute: int
+    trusted_proxies: int
+    pix_cache_size: int
+    pix_cache_ttl: int
+    pix_negative_cache_ttl: int
+    ledger_snapshot_grace: int
+    vault_key: str = field(repr=False)
+
+    @classmethod
+    def from_env(cls) -> 'Settings':
+        return cls(
+            app_key=_required('APP_KEY'),
+            sqlalchemy_database_uri=_required('SQLALCHEMY_DATABASE_URI'),
+            idempotency_ttl=_int('IDEMPOTENCY_TTL', 24 * 60 * 60, minimum=1),
+            idempotency_lease=_int('IDEMPOTENCY_LEASE', 60, minimum=1),
+            token_cache_size=_int('TOKEN_CACHE_SIZE', 10000),
+            reference_cache_ttl=_int('REFERENCE_CACHE_TTL', 60),
+            reference_negative_cache_ttl=_int('REFERENCE_NEGATIVE_CACHE_TTL', 5),
+            json_provider=_choice('JSON_PROVIDER', 'auto', ('auto', 'orjson', 'stdlib')),
+            db_pool_size=_int('DB_POOL_SIZE', 10, minimum=1),
+            db_max_overflow=_int('DB_MAX_OVERFLOW', 10),
+            db_pool_timeout=_int('DB_POOL_TIMEOUT', 30, minimum=1),
+            db_pool_recycle=_int('DB_POOL_RECYCLE', 1800, minimum=-1),
+            db_pool_pre_ping=_bool('DB_POOL_PRE_PING', True),
+            sqlalchemy_replica_uris=_list('SQLALCHEMY_REPLICA_URIS'),
+            read_your_writes_window=_int('READ_YOUR_WRITES_WINDOW', 5),
+            instrumentation=_bool('INSTRUMENTATION', False),
+            statement_budget=_int('STATEMENT_BUDGET', 25, minimum=1),
+            metrics_token=_secret('METRICS_TOKEN', 16),
+            password_hash_iterations=_int('PASSWORD_HASH_ITERATIONS', 600000, minimum=1),
+            password_hash_workers=_int('PASSWORD_HASH_WORKERS', os.cpu_count() or 1, minimum=1),
+            password_hash_timeout=_int('PASSWORD_HASH_TIMEOUT', 10, minimum=1),
+            login_user_burst=_int('LOGIN_USER_BURST', 5, minimum=1),
+            login_user_per_minute=_int('LOGIN_USER_PER_MINUTE', 10),
+            login_ip_burst=_int('LOGIN_IP_BURST', 20, minimum=1),
+            login_ip_per_minute=_int('LOGIN_IP_PER_MINUTE', 60),
+            trusted_proxies=_int('TRUSTED_PROXIES', 0),
+            pix_cache_size=_int('PIX_CACHE_SIZE', 100000),
+            pix_cache_ttl=_int('PIX_CACHE_TTL', 300),
+            pix_negative_cache_ttl=_int('PIX_NEGATIVE_CACHE_TTL', 5),
+            ledger_snapshot_grace=_int('LEDGER_SNAPSHOT_GRACE', 300),
+            vault_key=_secret('VAULT_KEY', 32)
+        )
+
+    def engine_options(self, uri: str | None = None) -> dict:
+        # O SQLite usa pools próprios (SingletonThreadPool/StaticPool) que não
+        # aceitam tamanho nem overflow.
+        if (uri or self.sqlalchemy_database_uri).startswith('sqlite'):
+            return {'pool_pre_ping': self.db_pool_pre_ping}
+
+        return {
+            'pool_size': self.db_pool_size,
+            'max_overflow': self.db_max_overflow,
+            'pool_timeout': self.db_pool_timeout,
+            'pool_recycle': self.db_pool_recycle,
+            'pool_pre_ping': self.db_pool_pre_ping
+        }
+
+    def replica_binds(self) -> dict:
+        return {
+            f'{REPLICA_BIND_PREFIX}{index}': {'url': uri, **self.engine_options(uri)}
+            for index, uri in enumerate(self.sqlalchemy_replica_uris)
+        }
+
+    def to_config(self) -> dict:
+        return {
+            'SETTINGS': self,
+            'APP_KEY': self.app_key,
+            'SQLALCHEMY_DATABASE_URI': self.sqlalchemy_database_uri,
+            'IDEMPOTENCY_TTL': self.idempotency_ttl,
+            'IDEMPOTENCY_LEASE': self.idempotency_lease,
+            'TOKEN_CACHE_SIZE': self.token_cache_size,
+            'REFERENCE_CACHE_TTL': self.reference_cache_ttl,
+            'REFERENCE_NEGATIVE_CACHE_TTL': self.reference_negative_cache_ttl,
+            'JSON_PROVIDER': self.json_provider,
+            'SQLALCHEMY_ENGINE_OPTIONS': self.engine_options(),
+            'SQLALCHEMY_BINDS': self.replica_binds(),
+            'READ_YOUR_WRITES_WINDOW': self.read_your_writes_window,
+            'INSTRUMENTATION': self.instrumentation,
+            'STATEMENT_BUDGET': self.statement_budget,
+            'METRICS_TOKEN': self.metrics_token,
+            'PASSWORD_HASH_ITERATIONS': self.password_hash_iterations,
+            'PASSWORD_HASH_WORKERS': self.password_hash_workers,
+            'PASSWORD_HASH_TIMEOUT': self.password_hash_timeout,
+            'LOGIN_USER_BURST': self.login_user_burst,
+            'LOGIN_USER_PER_MINUTE': self.login_user_per_minute,
+            'LOGIN_IP_BURST': self.login_ip_burst,
+            'LOGIN_IP_PER_MINUTE': self.login_ip_per_minute,
+            'TRUSTED_PROXIES': self.trusted_proxies,
+            'PIX_CACHE_SIZE': self.pix_cache_size,
+            'PIX_CACHE_TTL': self.pix_cache_ttl,
+            'PIX_NEGATIVE_CACHE_TTL': self.pix_negative_cache_ttl,
+            'LEDGER_SNAPSHOT_GRACE': self.ledger_snapshot_grace,
+            'VAULT_KEY': self.vault_key
+        }
+
+def reload_settings(app: Flask) -> Settings:
+    load_env()
+    new_settings = Settings.from_env()
+
+    new_config = new_settings.to_config()
+
+    for key in RESTART_ONLY:
+        if new_config.pop(key) != app.config[key]:
+            logger.warning(f'{key} só é aplicada ao reiniciar a aplicação.')
+
+    app.config.update(new_config)
+    return new_settings
+
+def init_settings(app: Flask) -> Settings:
+    loaded = Settings.from_env()
+    app.config.update(loaded.to_config())
+
+    def handle_reload(signum, frame) -> None:
+        try:
+            reload_settings(app)
+            logger.info('Configurações recarregadas.')
+        except SettingsError as error:
+            logger.error(f'Configurações mantidas, recarga inválida: {error}')
+
+    # A recarga é explícita (SIGHUP); fora da thread principal o sinal não pode
+    # ser registrado e a aplicação segue com as configurações carregadas.
+    if hasattr(signal, 'SIGHUP'):
+        try:
+            signal.signal(signal.SIGHUP, handle_reload)
+        except ValueError:
+            pass
+
+    return loaded
@@ -0,0 +1,19 @@
+from config.env import env
+import multiprocessing
+
+# Cada worker é um processo com o próprio pool de conexões: mantenha
+# GUNICORN_THREADS <= DB_POOL_SIZE + DB_MAX_OVERFLOW e
+# workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) abaixo do max_connections do MySQL.
+bind = env('GUNICORN_BIND') or '0.0.0.0:8000'
+workers = int(env('GUNICORN_WORKERS') or multiprocessing.cpu_count() * 2 + 1)
+threads = int(env('GUNICORN_THREADS') or 4)
+worker_class = 'gthread'
+timeout = int(env('GUNICORN_TIMEOUT') or 30)
+graceful_timeout = timeout
+keepalive = int(env('GUNICORN_KEEPALIVE') or 5)
+max_requests = int(env('GUNICORN_MAX_REQUESTS') or 10000)
+max_requests_jitter = max_requests // 10
+# Sem preload: o engine e o pool são criados depois do fork, em cada worker.
+preload_app = False
+accesslog = '-'
+errorlog = '-'
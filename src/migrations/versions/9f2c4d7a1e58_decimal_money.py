@@ -0,0 +1,56 @@
+"""decimal_money
+
+Revision ID: 9f2c4d7a1e58
+Revises: 5e7b3a9d0c16
+Create Date: 2026-10-18 11:14:52.084633
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9f2c4d7a1e58'
+down_revision = '5e7b3a9d0c16'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.alter_column('balance', existing_type=sa.Float(), type_=sa.Numeric(precision=15, scale=2), existing_nullable=False)
+
+    with op.batch_alter_table('transaction_types', schema=None) as batch_op:
+        batch_op.alter_column('tax', existing_type=sa.Float(), type_=sa.Numeric(precision=7, scale=4), existing_nullable=True)
+
+    with op.batch_alter_table('balance_snapshots', schema=None) as batch_op:
+        batch_op.alter_column('balance', existing_type=sa.Float(), type_=sa.Numeric(precision=15, scale=2), existing_nullable=False)
+
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.alter_column('amount', existing_type=sa.Float(), type_=sa.Numeric(precision=15, scale=2), existing_nullable=False)
+        batch_op.add_column(sa.Column('fee', sa.Numeric(precision=15, scale=2), nullable=False, server_default='0'))
+
+    # Até aqui a taxa não era registrada: o destinatário recebia amount / (1 + tax).
+    op.execute(
+        'UPDATE transactions SET fee = amount - ROUND(amount / (1 + COALESCE(('
+        'SELECT tax FROM transaction_types WHERE transaction_types.id = transactions.transaction_type_id'
+        '), 0)), 2) WHERE user_id <> 0'
+    )
+
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.alter_column('fee', existing_type=sa.Numeric(precision=15, scale=2), existing_nullable=False, server_default=None)
+
+
+def downgrade():
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_column('fee')
+        batch_op.alter_column('amount', existing_type=sa.Numeric(precision=15, scale=2), type_=sa.Float(), existing_nullable=False)
+
+    with op.batch_alter_table('balance_snapshots', schema=None) as batch_op:
+        batch_op.alter_column('balance', existing_type=sa.Numeric(precision=15, scale=2), type_=sa.Float(), existing_nullable=False)
+
+    with op.batch_alter_table('transaction_types', schema=None) as batch_op:
+        batch_op.alter_column('tax', existing_type=sa.Numeric(precision=7, scale=4), type_=sa.Float(), existing_nullable=True)
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.alter_column('balance', existing_type=sa.Numeric(precision=15, scale=2), type_=sa.Float(), existing_nullable=False)
@@ -0,0 +1,155 @@
+"""credit_card_vault
+
+Revision ID: b6e1f4c83a27
+Revises: d3a8e6b15f72
+Create Date: 2026-10-18 17:05:41.902117
+
+"""
+from alembic import op
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+from flask import current_app
+import os
+import secrets
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6e1f4c83a27'
+down_revision = 'd3a8e6b15f72'
+branch_labels = None
+depends_on = None
+
+
+credit_card = sa.table(
+    'credit_card',
+    sa.column('id', sa.Integer),
+    sa.column('number', sa.String),
+    sa.column('token', sa.String),
+    sa.column('pan_encrypted', sa.LargeBinary),
+    sa.column('last4', sa.String),
+    sa.column('brand', sa.String)
+)
+
+
+# Cópia do formato do cofre e da tabela de bandeiras vigentes nesta revisão:
+# mudanças futuras em services.card_vault e services.credit_card não alteram o
+# que esta migração faz.
+BLOB_VERSION = b'\x01'
+NONCE_SIZE = 12
+MIN_VAULT_KEY_LENGTH = 32
+BRANDS = (
+    ('elo', (
+        ('401178', '401179'), ('431274', '431274'), ('438935', '438935'), ('451416', '451416'),
+        ('457393', '457393'), ('457631', '457632'), ('504175', '504175'), ('506699', '506778'),
+        ('509000', '509999'), ('627780', '627780'), ('636297', '636297'), ('636368', '636368'),
+        ('650031', '650033'), ('650035', '650051'), ('650405', '650439'), ('650485', '650538'),
+        ('650541', '650598'), ('650700', '650718'), ('650720', '650727'), ('650901', '650920'),
+        ('651652', '651679'), ('655000', '655019'), ('655021', '655058')
+    )),
+    ('hipercard', (('606282', '606282'), ('3841', '3841'))),
+    ('amex', (('34', '34'), ('37', '37'))),
+    ('diners', (('300', '305'), ('36', '36'), ('38', '39'))),
+    ('jcb', (('3528', '3589'),)),
+    ('discover', (('6011', '6011'), ('644', '649'), ('65', '65'))),
+    ('mastercard', (('51', '55'), ('2221', '2720'))),
+    ('visa', (('4', '4'),))
+)
+
+
+def _card_brand(number):
+    for brand, ranges in BRANDS:
+        for low, high in ranges:
+            if low <= number[:len(low)] <= high:
+                return brand
+
+    return 'other'
+
+
+def _cipher(connection):
+    master_key = current_app.config.get('VAULT_KEY') or ''
+
+    if len(master_key) >= MIN_VAULT_KEY_LENGTH:
+        data_key = HKDF(algorithm=hashes.SHA256(), length=32, salt=None, info=b'pygamentos:credit_card:v1').derive(master_key.encode())
+        return AESGCM(data_key)
+
+    if connection.execute(sa.select(credit_card.c.id).limit(1)).first():
+        raise RuntimeError('Configure a VAULT_KEY antes de migrar os cartões de crédito existentes.')
+
+    return None
+
+
+def _encrypt(cipher, pan, token):
+    nonce = os.urandom(NONCE_SIZE)
+    return BLOB_VERSION + nonce + cipher.encrypt(nonce, pan.encode(), token.encode())
+
+
+def _decrypt(cipher, blob, token):
+    if blob[:1] != BLOB_VERSION:
+        raise RuntimeError('Versão do cartão cifrado desconhecida.')
+
+    return cipher.decrypt(blob[1:1 + NONCE_SIZE], blob[1 + NONCE_SIZE:], token.encode()).decode()
+
+
+def upgrade():
+    connection = op.get_bind()
+    cipher = _cipher(connection)
+
+    with op.batch_alter_table('credit_card', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('token', sa.String(length=40), nullable=True))
+        batch_op.add_column(sa.Column('pan_encrypted', sa.LargeBinary(), nullable=True))
+        batch_op.add_column(sa.Column('last4', sa.String(length=4), nullable=True))
+        batch_op.add_column(sa.Column('brand', sa.String(length=20), nullable=True))
+
+    rows = connection.execute(sa.select(credit_card.c.id, credit_card.c.number)).fetchall()
+
+    for row in rows:
+        token = f'card_{secrets.token_urlsafe(24)}'
+        connection.execute(credit_card.update().where(credit_card.c.id == row.id).values(
+            token=token,
+            pan_encrypted=_encrypt(cipher, row.number, token),
+            last4=row.number[-4:],
+            brand=_card_brand(row.number)
+        ))
+
+    # O CVV não pode ser armazenado depois da autorização e sai junto com o número.
+    with op.batch_alter_table('credit_card', schema=None) as batch_op:
+        batch_op.alter_column('token', existing_type=sa.String(length=40), nullable=False)
+        batch_op.alter_column('pan_encrypted', existing_type=sa.LargeBinary(), nullable=False)
+        batch_op.alter_column('last4', existing_type=sa.String(length=4), nullable=False)
+        batch_op.alter_column('brand', existing_type=sa.String(length=20), nullable=False)
+        batch_op.drop_index('ix_credit_card_user_id')
+        batch_op.create_index('ix_credit_card_user_id_deleted_at', ['user_id', 'deleted_at', 'token', 'brand', 'last4', 'validate', 'description'], unique=False)
+        batch_op.create_index('ix_credit_card_token', ['token'], unique=True)
+        batch_op.drop_column('number')
+        batch_op.drop_column('cvv')
+
+
+def downgrade():
+    connection = op.get_bind()
+    cipher = _cipher(connection)
+
+    # O cofre aceita PANs de 13 a 19 dígitos; a coluna restaurada comporta todos.
+    with op.batch_alter_table('credit_card', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('number', sa.String(length=19), nullable=True))
+        batch_op.add_column(sa.Column('cvv', sa.String(length=3), nullable=False, server_default=''))
+
+    rows = connection.execute(sa.select(credit_card.c.id, credit_card.c.token, credit_card.c.pan_encrypted)).fetchall()
+
+    for row in rows:
+        connection.execute(credit_card.update().where(credit_card.c.id == row.id).values(
+            number=_decrypt(cipher, row.pan_encrypted, row.token)
+        ))
+
+    # O CVV descartado não volta: as linhas ficam com o campo vazio.
+    with op.batch_alter_table('credit_card', schema=None) as batch_op:
+        batch_op.alter_column('number', existing_type=sa.String(length=19), nullable=False)
+        batch_op.alter_column('cvv', existing_type=sa.String(length=3), server_default=None)
+        batch_op.drop_index('ix_credit_card_token')
+        batch_op.drop_index('ix_credit_card_user_id_deleted_at')
+        batch_op.create_index('ix_credit_card_user_id', ['user_id'], unique=False)
+        batch_op.drop_column('brand')
+        batch_op.drop_column('last4')
+        batch_op.drop_column('pan_encrypted')
+        batch_op.drop_column('token')
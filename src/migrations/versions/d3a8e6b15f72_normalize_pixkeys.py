@@ -0,0 +1,167 @@
+"""normalize_pixkeys
+
+Revision ID: d3a8e6b15f72
+Revises: 9f2c4d7a1e58
+Create Date: 2026-10-18 15:40:12.318604
+
+"""
+from alembic import op
+import logging
+import re
+import sqlalchemy as sa
+import unicodedata
+import uuid
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3a8e6b15f72'
+down_revision = '9f2c4d7a1e58'
+branch_labels = None
+depends_on = None
+
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+# Cópia das regras de normalização vigentes nesta revisão: mudanças futuras em
+# services.pixkey_normalization não alteram o que esta migração faz.
+EMAIL_PATTERN = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+SEPARATORS = re.compile(r'[\s.\-/()]')
+DIGITS = re.compile(r'[0-9]+')
+
+
+class InvalidKey(ValueError):
+    pass
+
+
+def _digits(value):
+    return SEPARATORS.sub('', value)
+
+
+def _check_digit(digits, weights):
+    remainder = sum(int(digit) * weight for digit, weight in zip(digits, weights)) % 11
+    return '0' if remainder < 2 else str(11 - remainder)
+
+
+def _cpf(value):
+    digits = _digits(value)
+
+    if (
+        len(digits) != 11 or not DIGITS.fullmatch(digits) or len(set(digits)) == 1
+        or _check_digit(digits[:9], list(range(10, 1, -1))) != digits[9]
+        or _check_digit(digits[:10], list(range(11, 1, -1))) != digits[10]
+    ):
+        raise InvalidKey('CPF inválido.')
+
+    return digits
+
+
+def _cnpj(value):
+    digits = _digits(value)
+    weights = [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
+
+    if (
+        len(digits) != 14 or not DIGITS.fullmatch(digits) or len(set(digits)) == 1
+        or _check_digit(digits[:12], weights[1:]) != digits[12]
+        or _check_digit(digits[:13], weights) != digits[13]
+    ):
+        raise InvalidKey('CNPJ inválido.')
+
+    return digits
+
+
+def _phone(value):
+    digits = _digits(value)
+    international = digits.startswith('+')
+    digits = digits.lstrip('+')
+
+    if not DIGITS.fullmatch(digits):
+        raise InvalidKey('Telefone inválido.')
+
+    if not international and len(digits) in (10, 11):
+        digits = f'55{digits}'
+
+    if len(digits) < 8 or len(digits) > 15 or (not international and not digits.startswith('55')):
+        raise InvalidKey('Telefone inválido.')
+
+    return f'+{digits}'
+
+
+def _email(value):
+    email = value.strip().lower()
+
+    if not EMAIL_PATTERN.match(email):
+        raise InvalidKey('E-mail inválido.')
+
+    return email
+
+
+def _evp(value):
+    try:
+        evp = uuid.UUID(value.strip())
+    except ValueError:
+        raise InvalidKey('Chave aleatória inválida.')
+
+    if evp.version != 4:
+        raise InvalidKey('Chave aleatória inválida.')
+
+    return str(evp)
+
+
+NORMALIZERS = {
+    'CPF': _cpf,
+    'CNPJ': _cnpj,
+    'TELEFONE': _phone,
+    'CELULAR': _phone,
+    'PHONE': _phone,
+    'EMAIL': _email,
+    'E-MAIL': _email,
+    'EVP': _evp,
+    'ALEATORIA': _evp,
+    'CHAVE ALEATORIA': _evp
+}
+
+
+def normalize_key(type_description, key):
+    decomposed = unicodedata.normalize('NFKD', (type_description or '').strip().upper())
+    normalizer = NORMALIZERS.get(''.join(char for char in decomposed if not unicodedata.combining(char)))
+    return normalizer(key) if normalizer else key.strip()
+
+
+pixkeys = sa.table('pixkeys', sa.column('id', sa.Integer), sa.column('key_type_id', sa.Integer), sa.column('key', sa.String))
+pix_key_type = sa.table('pix_key_type', sa.column('id', sa.Integer), sa.column('description', sa.String))
+
+
+def upgrade():
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.select(pixkeys.c.id, pixkeys.c.key, pix_key_type.c.description)
+        .select_from(pixkeys.outerjoin(pix_key_type, pix_key_type.c.id == pixkeys.c.key_type_id))
+        .order_by(pixkeys.c.id)
+    ).fetchall()
+    taken = {row.key for row in rows}
+
+    # Quando duas chaves têm a mesma forma canônica, ela fica com a que já está
+    # normalizada ou com a mais antiga; chaves inválidas ou que colidiriam são
+    # mantidas como estão e listadas para revisão.
+    for row in rows:
+        try:
+            normalized = normalize_key(row.description, row.key)
+        except InvalidKey as error:
+            logger.warning('pixkeys.id=%s: %s Chave mantida: %r', row.id, error, row.key)
+            continue
+
+        if normalized == row.key:
+            continue
+
+        if normalized in taken or len(normalized) > 50:
+            logger.warning('pixkeys.id=%s: %r já existe ou é longa demais. Chave mantida: %r', row.id, normalized, row.key)
+            continue
+
+        connection.execute(pixkeys.update().where(pixkeys.c.id == row.id).values(key=normalized))
+        taken.discard(row.key)
+        taken.add(normalized)
+
+
+def downgrade():
+    # A formatação original das chaves não é guardada; não há o que desfazer.
+    pass
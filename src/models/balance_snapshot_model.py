@@ -0,0 +1,26 @@
+from config.database import db
+from datetime import datetime
+from sqlalchemy import (
+    Column,
+    Integer,
+    Numeric,
+    DateTime,
+    Index
+)
+
+class BalanceSnapshot(db.Model):
+    __tablename__ = 'balance_snapshots'
+    __table_args__ = (
+        Index('ix_balance_snapshots_user_id_last_transaction_id', 'user_id', 'last_transaction_id'),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    balance = Column(Numeric(15, 2), nullable=False)
+    last_transaction_id = Column(Integer, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __init__(self, user_id, balance, last_transaction_id):
+        self.user_id = user_id
+        self.balance = balance
+        self.last_transaction_id = last_transaction_id
@@ -4,18 +4,28 @@ from sqlalchemy import (
     Column,
     Integer,
     String,
+    LargeBinary,
     DateTime,
-    ForeignKey
+    ForeignKey,
+    Index
 )
 
 class CreditCard(db.Model):
     __tablename__ = 'credit_card'
+    __table_args__ = (
+        # Índice de cobertura da listagem: as colunas depois de (user_id,
+        # deleted_at) são as devolvidas por list_credit_cards.
+        Index('ix_credit_card_user_id_deleted_at', 'user_id', 'deleted_at', 'token', 'brand', 'last4', 'validate', 'description'),
+        Index('ix_credit_card_token', 'token', unique=True),
+    )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, nullable=False)
-    number = Column(String(16), nullable=False)
+    token = Column(String(40), nullable=False)
+    pan_encrypted = Column(LargeBinary, nullable=False)
+    last4 = Column(String(4), nullable=False)
+    brand = Column(String(20), nullable=False)
     validate = Column(String(7), nullable=False)
-    cvv = Column(String(3), nullable=False)
     description = Column(String(60))
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -24,13 +34,17 @@ class CreditCard(db.Model):
     def __init__(
         self,
         user_id,
-        number,
+        token,
+        pan_encrypted,
+        last4,
+        brand,
         validate,
-        cvv,
         description
     ):
         self.user_id = user_id
-        self.number = number
+        self.token = token
+        self.pan_encrypted = pan_encrypted
+        self.last4 = last4
+        self.brand = brand
         self.validate = validate
-        self.cvv = cvv
         self.description = description
\ No newline at end of file
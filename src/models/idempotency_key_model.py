@@ -0,0 +1,32 @@
+from config.database import db
+from datetime import datetime
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Text,
+    DateTime,
+    Index
+)
+
+class IdempotencyKey(db.Model):
+    __tablename__ = 'idempotency_keys'
+    __table_args__ = (
+        Index('ix_idempotency_keys_user_id_key', 'user_id', 'key', unique=True),
+        Index('ix_idempotency_keys_expires_at', 'expires_at'),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    key = Column(String(64), nullable=False)
+    endpoint = Column(String(80), nullable=False)
+    status_code = Column(Integer)
+    response_body = Column(Text)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
+
+    def __init__(self, user_id, key, endpoint, expires_at):
+        self.user_id = user_id
+        self.key = key
+        self.endpoint = endpoint
+        self.expires_at = expires_at
@@ -5,11 +5,16 @@ from sqlalchemy import (
     Integer,
     String,
     DateTime,
-    ForeignKey
+    ForeignKey,
+    Index
 )
 
 class PixKey(db.Model):
     __tablename__ = 'pixkeys'
+    __table_args__ = (
+        Index('ix_pixkeys_key', 'key', unique=True),
+        Index('ix_pixkeys_user_id', 'user_id'),
+    )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer)
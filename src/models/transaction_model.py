@@ -4,27 +4,51 @@ from sqlalchemy import (
     Column,
     Integer,
     String,
-    Float,
+    Numeric,
     DateTime,
-    ForeignKey
+    ForeignKey,
+    Index
 )
+from sqlalchemy.orm import relationship
 
 class Transaction(db.Model):
     __tablename__ = 'transactions'
+    __table_args__ = (
+        Index('ix_transactions_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+        Index('ix_transactions_user_dest_created_at_id', 'user_dest', 'created_at', 'id'),
+    )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, nullable=False)
     user_dest = Column(Integer, nullable=False)
     transaction_type_id = Column(Integer, nullable=False)
-    amount = Column(Float, nullable=False)
+    amount = Column(Numeric(15, 2), nullable=False)
+    fee = Column(Numeric(15, 2), nullable=False, default=0)
     description = Column(String(80), nullable=False)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     deleted_at = Column(DateTime)
 
-    def __init__(self, user_id, user_dest, transaction_type_id, amount, description):
+    transaction_type = relationship(
+        'TransactionTypes',
+        primaryjoin='foreign(Transaction.transaction_type_id) == TransactionTypes.id',
+        viewonly=True
+    )
+    sender = relationship(
+        'User',
+        primaryjoin='foreign(Transaction.user_id) == User.id',
+        viewonly=True
+    )
+    receiver = relationship(
+        'User',
+        primaryjoin='foreign(Transaction.user_dest) == User.id',
+        viewonly=True
+    )
+
+    def __init__(self, user_id, user_dest, transaction_type_id, amount, description, fee=0):
         self.user_id = user_id
         self.user_dest = user_dest
         self.transaction_type_id = transaction_type_id
         self.amount = amount
+        self.fee = fee
         self.description = description
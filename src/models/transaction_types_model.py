@@ -5,7 +5,7 @@ from sqlalchemy import (
     Integer,
     String,
     DateTime,
-    Float
+    Numeric
 )
 
 class TransactionTypes(db.Model):
@@ -13,7 +13,7 @@ class TransactionTypes(db.Model):
 
     id = Column(Integer, primary_key=True)
     description = Column(String(40), nullable=False)
-    tax = Column(Float, default=0.0)
+    tax = Column(Numeric(7, 4), default=0)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     deleted_at = Column(DateTime)
@@ -0,0 +1,67 @@
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+from flask import Flask
+from threading import Lock
+import os
+
+BLOB_VERSION = b'\x01'
+NONCE_SIZE = 12
+MIN_VAULT_KEY_LENGTH = 32
+
+class VaultError(RuntimeError):
+    pass
+
+class CardVault:
+    # O PAN é cifrado com AES-GCM e o token do cartão entra como dado associado,
+    # então um blob copiado para outra linha não decifra. A chave de dados é
+    # derivada da VAULT_KEY uma única vez por processo.
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._ciphers: dict[str, AESGCM] = {}
+        self._config = {'VAULT_KEY': ''}
+
+    def init_app(self, app: Flask) -> None:
+        self._config = app.config
+
+    @property
+    def configured(self) -> bool:
+        return len(self._config['VAULT_KEY'] or '') >= MIN_VAULT_KEY_LENGTH
+
+    def _cipher(self) -> AESGCM:
+        master_key = self._config['VAULT_KEY'] or ''
+        cipher = self._ciphers.get(master_key)
+
+        if cipher is not None:
+            return cipher
+
+        if len(master_key) < MIN_VAULT_KEY_LENGTH:
+            raise VaultError(f'VAULT_KEY deve ter pelo menos {MIN_VAULT_KEY_LENGTH} caracteres.')
+
+        with self._lock:
+            if master_key not in self._ciphers:
+                data_key = HKDF(algorithm=hashes.SHA256(), length=32, salt=None, info=b'pygamentos:credit_card:v1').derive(master_key.encode())
+                self._ciphers[master_key] = AESGCM(data_key)
+
+            return self._ciphers[master_key]
+
+    def encrypt(self, pan: str, token: str) -> bytes:
+        nonce = os.urandom(NONCE_SIZE)
+        return BLOB_VERSION + nonce + self._cipher().encrypt(nonce, pan.encode(), token.encode())
+
+    def decrypt(self, blob: bytes, token: str) -> str:
+        if blob[:1] != BLOB_VERSION:
+            raise VaultError('Versão do cartão cifrado desconhecida.')
+
+        nonce = blob[1:1 + NONCE_SIZE]
+
+        try:
+            return self._cipher().decrypt(nonce, blob[1 + NONCE_SIZE:], token.encode()).decode()
+        except InvalidTag:
+            raise VaultError('Não foi possível decifrar o cartão com a VAULT_KEY atual.')
+
+card_vault = CardVault()
+
+def init_card_vault(app: Flask) -> None:
+    card_vault.init_app(app)
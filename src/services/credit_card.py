@@ -0,0 +1,163 @@
+from datetime import datetime
+from models.credit_card_model import CreditCard
+from services.card_vault import card_vault
+import re
+import secrets
+
+SEPARATORS = re.compile(r'[\s\-]')
+NUMBER_PATTERN = re.compile(r'[0-9]{13,19}')
+VALIDATE_PATTERN = re.compile(r'^(0[1-9]|1[0-2])/([0-9]{2}|[0-9]{4})$')
+MAX_DESCRIPTION_LENGTH = 60
+
+# Faixas de BIN por bandeira, na ordem de verificação: Elo e Hipercard usam
+# faixas que também começam com 4, 5 e 6 e precisam vir antes de Visa,
+# Mastercard e Discover.
+BRANDS = (
+    ('elo', (
+        ('401178', '401179'), ('431274', '431274'), ('438935', '438935'), ('451416', '451416'),
+        ('457393', '457393'), ('457631', '457632'), ('504175', '504175'), ('506699', '506778'),
+        ('509000', '509999'), ('627780', '627780'), ('636297', '636297'), ('636368', '636368'),
+        ('650031', '650033'), ('650035', '650051'), ('650405', '650439'), ('650485', '650538'),
+        ('650541', '650598'), ('650700', '650718'), ('650720', '650727'), ('650901', '650920'),
+        ('651652', '651679'), ('655000', '655019'), ('655021', '655058')
+    )),
+    ('hipercard', (('606282', '606282'), ('3841', '3841'))),
+    ('amex', (('34', '34'), ('37', '37'))),
+    ('diners', (('300', '305'), ('36', '36'), ('38', '39'))),
+    ('jcb', (('3528', '3589'),)),
+    ('discover', (('6011', '6011'), ('644', '649'), ('65', '65'))),
+    ('mastercard', (('51', '55'), ('2221', '2720'))),
+    ('visa', (('4', '4'),))
+)
+
+class CreditCardError(Exception):
+    def __init__(self, message: str, code: int = 400) -> None:
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+def is_valid_luhn(digits: str) -> bool:
+    total = 0
+
+    for position, digit in enumerate(reversed(digits)):
+        value = int(digit) * (2 if position % 2 else 1)
+        total += value - 9 if value > 9 else value
+
+    return total % 10 == 0
+
+def card_brand(number: str) -> str:
+    for brand, ranges in BRANDS:
+        for low, high in ranges:
+            if low <= number[:len(low)] <= high:
+                return brand
+
+    return 'other'
+
+def _card_number(value) -> str:
+    number = SEPARATORS.sub('', value) if isinstance(value, str) else ''
+
+    if not NUMBER_PATTERN.fullmatch(number) or not is_valid_luhn(number):
+        raise CreditCardError('Número do cartão inválido.')
+
+    return number
+
+def _validate(value) -> str:
+    match = VALIDATE_PATTERN.match(value.strip()) if isinstance(value, str) else None
+
+    if not match:
+        raise CreditCardError('Validade do cartão inválida. Use MM/AAAA.')
+
+    month, year = int(match.group(1)), int(match.group(2))
+    year = year + 2000 if year < 100 else year
+    today = datetime.utcnow()
+
+    if (year, month) < (today.year, today.month):
+        raise CreditCardError('Cartão de crédito vencido.')
+
+    return f'{month:02d}/{year}'
+
+def _description(value) -> str | None:
+    if value is None:
+        return None
+
+    if not isinstance(value, str) or len(value) > MAX_DESCRIPTION_LENGTH:
+        raise CreditCardError(f'A descrição deve ter no máximo {MAX_DESCRIPTION_LENGTH} caracteres.')
+
+    return value
+
+def list_credit_cards(session, user_id: int) -> list[dict]:
+    # Só as colunas do índice (user_id, deleted_at, ...): a listagem não lê a
+    # linha da tabela nem o PAN cifrado.
+    rows = session.query(
+        CreditCard.id,
+        CreditCard.token,
+        CreditCard.brand,
+        CreditCard.last4,
+        CreditCard.validate,
+        CreditCard.description
+    ).filter(CreditCard.user_id == user_id, CreditCard.deleted_at.is_(None)).order_by(CreditCard.id)
+
+    return [format_credit_card(row) for row in rows]
+
+def add_credit_card(session, user_id: int, data: dict) -> dict:
+    if not card_vault.configured:
+        raise CreditCardError('O cadastro de cartões não está disponível.', 503)
+
+    number = _card_number(data.get('number'))
+    validate = _validate(data.get('validate'))
+    description = _description(data.get('description'))
+
+    # O CVV é conferido, mas nunca armazenado.
+    if not isinstance(data.get('cvv'), str) or not re.fullmatch(r'[0-9]{3,4}', data['cvv']):
+        raise CreditCardError('CVV inválido.')
+
+    token = f'card_{secrets.token_urlsafe(24)}'
+    new_credit_card = CreditCard(
+        user_id=user_id,
+        token=token,
+        pan_encrypted=card_vault.encrypt(number, token),
+        last4=number[-4:],
+        brand=card_brand(number),
+        validate=validate,
+        description=description
+    )
+
+    session.add(new_credit_card)
+    session.commit()
+    return format_credit_card(new_credit_card)
+
+def payment_card(session, user_id: int, credit_card_id: int) -> dict | None:
+    # Único ponto que decifra o PAN; deve ser chamado apenas ao enviar o
+    # pagamento à adquirente e o resultado nunca deve ser registrado em log.
+    credit_card = session.query(CreditCard).filter(
+        CreditCard.id == credit_card_id,
+        CreditCard.user_id == user_id,
+        CreditCard.deleted_at.is_(None)
+    ).first()
+
+    if not credit_card:
+        return None
+
+    return {
+        **format_credit_card(credit_card),
+        'number': card_vault.decrypt(credit_card.pan_encrypted, credit_card.token)
+    }
+
+def remove_credit_card(session, user_id: int, credit_card_id: int) -> bool:
+    removed = session.query(CreditCard).filter(
+        CreditCard.id == credit_card_id,
+        CreditCard.user_id == user_id
+    ).delete(synchronize_session=False)
+
+    session.commit()
+    return removed > 0
+
+def format_credit_card(credit_card) -> dict:
+    return {
+        'id': credit_card.id,
+        'token': credit_card.token,
+        'brand': credit_card.brand,
+        'last4': credit_card.last4,
+        'validate': credit_card.validate,
+        'description': credit_card.description
+    }
@@ -0,0 +1,153 @@
+from datetime import datetime
+from typing import Callable, Iterable, Iterator
+import csv
+import io
+import zipfile
+import zlib
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_COLUMNS = ['id', 'type', 'description', 'amount', 'datetime', 'receiver', 'sender']
+FORMATS = {
+    'ndjson': ('ndjson', 'application/x-ndjson'),
+    'csv': ('csv', 'text/csv'),
+    'parquet': ('parquet', 'application/vnd.apache.parquet')
+}
+COMPRESSIONS = {
+    'none': (None, None),
+    'gzip': ('gz', 'application/gzip'),
+    'zip': ('zip', 'application/zip')
+}
+
+class ExportError(ValueError):
+    pass
+
+class _ChunkSink(io.RawIOBase):
+    # Destino de escrita sem `seek`/`tell`: o zipfile e o pyarrow escrevem aqui e
+    # os bytes acumulados são repassados à resposta a cada lote.
+    def __init__(self) -> None:
+        self._chunks = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+def _batches(rows: Iterable[dict]) -> Iterator[list[dict]]:
+    batch = []
+
+    for row in rows:
+        batch.append(row)
+
+        if len(batch) == EXPORT_BATCH_SIZE:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+def _ndjson(rows: Iterable[dict], dumps: Callable) -> Iterator[bytes]:
+    for batch in _batches(rows):
+        yield ''.join(dumps(row) + '\n' for row in batch).encode()
+
+def _csv(rows: Iterable[dict]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+
+    for batch in _batches(rows):
+        writer.writerows({
+            key: value.isoformat(timespec='seconds') if isinstance(value, datetime) else value
+            for key, value in row.items()
+        } for row in batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+    yield buffer.getvalue().encode()
+
+def _parquet(rows: Iterable[dict]) -> Iterator[bytes]:
+    schema = pyarrow.schema([
+        ('id', pyarrow.int64()),
+        ('type', pyarrow.string()),
+        ('description', pyarrow.string()),
+        ('amount', pyarrow.decimal128(15, 2)),
+        ('datetime', pyarrow.timestamp('us')),
+        ('receiver', pyarrow.string()),
+        ('sender', pyarrow.string())
+    ])
+    sink = _ChunkSink()
+
+    # Cada lote vira um row group, enviado assim que escrito; o rodapé sai no fechamento.
+    with pyarrow.parquet.ParquetWriter(sink, schema) as writer:
+        for batch in _batches(rows):
+            writer.write_table(pyarrow.Table.from_pylist(batch, schema=schema))
+            yield sink.drain()
+
+    yield sink.drain()
+
+def _gzip(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)
+
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+
+        if compressed:
+            yield compressed
+
+    yield compressor.flush()
+
+def _zip(chunks: Iterable[bytes], filename: str) -> Iterator[bytes]:
+    sink = _ChunkSink()
+
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_DEFLATED) as archive:
+        with archive.open(filename, 'w', force_zip64=True) as entry:
+            for chunk in chunks:
+                entry.write(chunk)
+                yield sink.drain()
+
+    yield sink.drain()
+
+def export_metadata(export_format: str, compression: str, basename: str) -> tuple[str, str]:
+    if export_format not in FORMATS:
+        raise ExportError('Formato de exportação inválido. Use ndjson, csv ou parquet.')
+
+    if compression not in COMPRESSIONS:
+        raise ExportError('Compressão inválida. Use none, gzip ou zip.')
+
+    if export_format == 'parquet' and pyarrow is None:
+        raise ExportError('Exportação em parquet indisponível: instale o pacote pyarrow.')
+
+    extension, mimetype = FORMATS[export_format]
+    filename = f'{basename}.{extension}'
+    compressed_extension, compressed_mimetype = COMPRESSIONS[compression]
+
+    if compressed_extension:
+        return f'{filename}.{compressed_extension}', compressed_mimetype
+
+    return filename, mimetype
+
+def export_rows(rows: Iterable[dict], export_format: str, compression: str, basename: str, dumps: Callable) -> Iterator[bytes]:
+    if export_format == 'ndjson':
+        chunks = _ndjson(rows, dumps)
+    else:
+        chunks = {'csv': _csv, 'parquet': _parquet}[export_format](rows)
+
+    if compression == 'gzip':
+        chunks = _gzip(chunks)
+    elif compression == 'zip':
+        chunks = _zip(chunks, f'{basename}.{FORMATS[export_format][0]}')
+
+    return (chunk for chunk in chunks if chunk)
@@ -0,0 +1,151 @@
+from config.pagination import InvalidPageRequest, keyset_page, parse_datetime
+from config.response import STREAM_BATCH_SIZE
+from dataclasses import dataclass
+from datetime import datetime
+from models.transaction_model import Transaction
+from models.user_model import User
+from services.reference_cache import transaction_types_cache
+from sqlalchemy import func, or_
+from sqlalchemy.orm import joinedload
+
+DIRECTIONS = ('sent', 'received', 'all')
+
+class IncompleteHistoryStream(RuntimeError):
+    pass
+
+@dataclass(frozen=True)
+class HistoryFilter:
+    direction: str = 'all'
+    transaction_type: int | None = None
+    start_date: datetime | None = None
+    end_date: datetime | None = None
+
+    @classmethod
+    def from_args(cls, args) -> 'HistoryFilter':
+        direction = args.get('direction', 'all')
+
+        if direction not in DIRECTIONS:
+            raise InvalidPageRequest('direction')
+
+        transaction_type = None
+
+        if 'transaction_type' in args:
+            try:
+                transaction_type = int(args['transaction_type'])
+            except ValueError:
+                raise InvalidPageRequest('transaction_type')
+
+        return cls(
+            direction=direction,
+            transaction_type=transaction_type,
+            start_date=parse_datetime(args.get('start_date')),
+            end_date=parse_datetime(args.get('end_date'))
+        )
+
+def current_balance(session, user_id: int):
+    return session.query(User.balance).filter_by(id=user_id).scalar()
+
+def _apply_filter(query, history_filter: HistoryFilter):
+    if history_filter.transaction_type is not None:
+        query = query.filter(Transaction.transaction_type_id == history_filter.transaction_type)
+    if history_filter.start_date:
+        query = query.filter(Transaction.created_at >= history_filter.start_date)
+    if history_filter.end_date:
+        query = query.filter(Transaction.created_at < history_filter.end_date)
+
+    return query
+
+def _history_query(session, history_filter: HistoryFilter):
+    return _apply_filter(session.query(Transaction).options(
+        joinedload(Transaction.sender),
+        joinedload(Transaction.receiver)
+    ), history_filter)
+
+def _filter_direction(query, user_id: int, direction: str):
+    if direction == 'sent':
+        return query.filter(Transaction.user_id == user_id)
+    if direction == 'received':
+        return query.filter(Transaction.user_dest == user_id)
+
+    return query.filter(or_(Transaction.user_id == user_id, Transaction.user_dest == user_id))
+
+def history_page(session, user_id: int, history_filter: HistoryFilter, cursor: str | None, limit: int) -> tuple[list, str | None]:
+    query = _history_query(session, history_filter)
+    queries = []
+
+    if history_filter.direction in ('sent', 'all'):
+        queries.append(query.filter(Transaction.user_id == user_id))
+    if history_filter.direction in ('received', 'all'):
+        queries.append(query.filter(Transaction.user_dest == user_id))
+
+    return keyset_page(queries, Transaction.created_at, Transaction.id, cursor, limit)
+
+def history_count(session, user_id: int, history_filter: HistoryFilter) -> int:
+    query = _apply_filter(session.query(func.count(Transaction.id)), history_filter)
+    return _filter_direction(query, user_id, history_filter.direction).scalar()
+
+def history_stream(session, user_id: int, history_filter: HistoryFilter, verify_count: bool = False):
+    # Uma única consulta com cursor no servidor: o MySQL não permite dois
+    # resultados não bufferizados abertos na mesma conexão, e o PyMySQL
+    # descartaria em silêncio o restante do cursor. Por isso os tipos (e a
+    # contagem, quando pedida) são resolvidos antes de abrir o cursor e nenhuma
+    # consulta roda durante a leitura.
+    types = transaction_types(session)
+    expected = history_count(session, user_id, history_filter) if verify_count else None
+    query = _filter_direction(_history_query(session, history_filter), user_id, history_filter.direction)
+    sent = 0
+
+    for transaction in query.order_by(Transaction.created_at.desc(), Transaction.id.desc()).yield_per(STREAM_BATCH_SIZE):
+        sent += 1
+        yield format_full_transaction(transaction, types)
+
+    # Contagem e cursor leem o mesmo snapshot da transação. Uma diferença
+    # interrompe a resposta em vez de entregar um arquivo truncado como completo.
+    if expected is not None and sent != expected:
+        raise IncompleteHistoryStream(f'Histórico incompleto: {sent} de {expected} transações enviadas.')
+
+def transaction_types(session, transactions: list | None = None) -> dict[int, dict]:
+    if transactions is None:
+        return {row['id']: row for row in transaction_types_cache.all(session)}
+
+    return transaction_types_cache.get_many({t.transaction_type_id for t in transactions}, session)
+
+def _type_description(transaction, types: dict[int, dict]) -> str | None:
+    transaction_type = types.get(transaction.transaction_type_id)
+    return transaction_type['description'] if transaction_type else None
+
+def _username(user) -> str | None:
+    return user.username if user else None
+
+def format_full_transaction(transaction, types: dict[int, dict]) -> dict:
+    return {
+        'id': transaction.id,
+        'type': _type_description(transaction, types),
+        'description': transaction.description,
+        'amount': transaction.amount,
+        'datetime': transaction.created_at,
+        'receiver': _username(transaction.receiver),
+        'sender': _username(transaction.sender)
+    }
+
+def format_transaction(transaction, types: dict[int, dict], is_payment=False) -> dict:
+    amount = transaction.amount * -1 if is_payment else transaction.amount
+    return {
+        'id': transaction.id,
+        'type': _type_description(transaction, types),
+        'description': transaction.description,
+        'amount': amount,
+        'paid_for_received_from': _username(transaction.receiver if is_payment else transaction.sender),
+        'datetime': transaction.created_at
+    }
+
+def format_full_transactions(session, transactions: list) -> list[dict]:
+    types = transaction_types(session, transactions)
+    return [format_full_transaction(t, types) for t in transactions]
+
+def split_history(session, transactions: list, user_id: int) -> dict:
+    types = transaction_types(session, transactions)
+    return {
+        'payments': [format_transaction(t, types, is_payment=True) for t in transactions if t.user_id == user_id],
+        'received': [format_transaction(t, types) for t in transactions if t.user_dest == user_id]
+    }
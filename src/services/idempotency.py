@@ -0,0 +1,170 @@
+from config.database import DEFERRED_COMMIT_INFO_KEY, db
+from config.response import response
+from datetime import datetime, timedelta
+from flask import current_app, request
+from models.idempotency_key_model import IdempotencyKey
+from sqlalchemy.exc import IntegrityError
+from functools import wraps
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+MAX_KEY_LENGTH = 64
+
+class ReservationLost(RuntimeError):
+    pass
+
+def _ttl() -> timedelta:
+    return timedelta(seconds=current_app.config['IDEMPOTENCY_TTL'])
+
+def _lease() -> timedelta:
+    return timedelta(seconds=current_app.config['IDEMPOTENCY_LEASE'])
+
+def _find(session, user_id, key) -> IdempotencyKey | None:
+    return session.query(IdempotencyKey).filter_by(user_id=user_id, key=key).populate_existing().first()
+
+def _reserve(session, user_id, key, endpoint, lease: timedelta) -> IdempotencyKey | None:
+    # A chave é registrada antes da operação: o índice único garante que apenas
+    # uma das requisições concorrentes com a mesma chave seja executada. Até a
+    # resposta ser gravada, a reserva só vale pelo `lease`. O prazo é truncado
+    # em segundos para ser comparado com o valor gravado no DATETIME.
+    expires_at = (datetime.utcnow() + lease).replace(microsecond=0)
+    record = IdempotencyKey(user_id=user_id, key=key, endpoint=endpoint, expires_at=expires_at)
+    session.add(record)
+
+    try:
+        session.flush()
+    except IntegrityError:
+        session.rollback()
+        return None
+
+    # Desanexado, o registro mantém o id e o prazo da reserva, que a identificam,
+    # mesmo depois dos commits e rollbacks da operação.
+    session.expunge(record)
+    session.commit()
+    return record
+
+def claim(session, user_id, key, endpoint, lease: timedelta) -> tuple[IdempotencyKey | None, IdempotencyKey | None]:
+    # Retorna (registro reservado, registro existente): no máximo um dos dois é preenchido.
+    now = datetime.utcnow()
+    record = _find(session, user_id, key)
+
+    # Chave expirada ou reserva cujo processo morreu antes de gravar a resposta
+    # (e, portanto, a operação). A remoção é condicional: a requisição original
+    # pode ter concluído depois da leitura.
+    if record and record.expires_at <= now:
+        session.query(IdempotencyKey).filter(
+            IdempotencyKey.id == record.id,
+            IdempotencyKey.expires_at <= now
+        ).delete()
+        session.commit()
+        record = _find(session, user_id, key)
+
+    if record:
+        return None, record
+
+    # A reserva perdida pode ter sido removida em seguida (falha 5xx ou
+    # expiração) antes da leitura: nesse caso tenta reservar uma segunda vez.
+    for _ in range(2):
+        reserved = _reserve(session, user_id, key, endpoint, lease)
+
+        if reserved is not None:
+            return reserved, None
+
+        existing = _find(session, user_id, key)
+
+        if existing is not None:
+            return None, existing
+
+    return None, None
+
+def replay_error(record: IdempotencyKey | None, endpoint: str) -> tuple[int, str] | None:
+    if record is None:
+        return 409, 'Uma requisição com esta chave de idempotência está em andamento. Tente novamente.'
+
+    if record.endpoint != endpoint:
+        return 422, 'Chave de idempotência já utilizada em outra operação.'
+
+    if record.status_code is None:
+        return 409, 'Uma requisição com esta chave de idempotência ainda está em processamento.'
+
+    return None
+
+def _reservation(session, record: IdempotencyKey):
+    # A linha só continua sendo desta requisição enquanto está pendente e com o
+    # mesmo prazo: depois do `lease`, outra requisição pode tê-la retomado.
+    return session.query(IdempotencyKey).filter(
+        IdempotencyKey.id == record.id,
+        IdempotencyKey.status_code.is_(None),
+        IdempotencyKey.expires_at == record.expires_at
+    )
+
+def complete(session, record: IdempotencyKey, code: int, body: str, ttl: timedelta) -> None:
+    # Grava a resposta na mesma transação que a operação: ou as duas são
+    # confirmadas, ou nenhuma.
+    if code >= 500:
+        release(session, record)
+        return
+
+    updated = _reservation(session, record).update({
+        'status_code': code,
+        'response_body': body,
+        'expires_at': datetime.utcnow() + ttl
+    }, synchronize_session=False)
+
+    if not updated:
+        raise ReservationLost('A reserva da chave de idempotência expirou antes da conclusão.')
+
+    session.commit()
+
+def release(session, record: IdempotencyKey) -> None:
+    # Desfaz a operação, que ainda não foi confirmada, e libera a chave.
+    session.rollback()
+    _reservation(session, record).delete(synchronize_session=False)
+    session.commit()
+
+def _replay(record: IdempotencyKey | None):
+    error = replay_error(record, request.endpoint)
+
+    if error:
+        code, message = error
+        return response(status=False, code=code, message=message)
+
+    replayed = current_app.response_class(record.response_body, status=record.status_code, mimetype='application/json')
+    replayed.headers[REPLAYED_HEADER] = 'true'
+    return replayed
+
+def idempotent(handler_func):
+    @wraps(handler_func)
+    def wrapper(decoded_token):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+
+        if not key:
+            return handler_func(decoded_token)
+
+        if len(key) > MAX_KEY_LENGTH:
+            return response(status=False, code=400, message='Chave de idempotência inválida.')
+
+        record, existing = claim(db.session, decoded_token['user']['id'], key, request.endpoint, _lease())
+
+        if record is None:
+            return _replay(existing)
+
+        db.session.info[DEFERRED_COMMIT_INFO_KEY] = True
+
+        try:
+            result, code = handler_func(decoded_token)
+            complete(db.session, record, code, result.get_data(as_text=True), _ttl())
+        except Exception:
+            release(db.session, record)
+            raise
+        finally:
+            db.session.info.pop(DEFERRED_COMMIT_INFO_KEY, None)
+
+        return result, code
+
+    return wrapper
+
+def purge_expired() -> int:
+    deleted = db.session.query(IdempotencyKey).filter(IdempotencyKey.expires_at <= datetime.utcnow()).delete()
+    db.session.commit()
+    return deleted
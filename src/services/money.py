@@ -0,0 +1,30 @@
+from decimal import Decimal, InvalidOperation, ROUND_HALF_EVEN
+
+CENTS = Decimal('0.01')
+ZERO = Decimal('0.00')
+
+def to_money(value) -> Decimal:
+    return to_decimal(value).quantize(CENTS, rounding=ROUND_HALF_EVEN)
+
+def to_decimal(value) -> Decimal:
+    if isinstance(value, bool) or value is None:
+        raise InvalidOperation(value)
+
+    # Floats passam por str() para preservar o valor decimal digitado (0.1 e não
+    # 0.1000000000000000055511151231257827...).
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+def parse_amount(value) -> Decimal | None:
+    try:
+        amount = to_decimal(value)
+    except (InvalidOperation, ValueError):
+        return None
+
+    if not amount.is_finite() or amount <= 0 or amount != amount.quantize(CENTS):
+        return None
+
+    return amount.quantize(CENTS)
+
+def apply_tax(amount: Decimal, tax) -> tuple[Decimal, Decimal]:
+    fee = to_money(amount * to_decimal(tax or 0))
+    return amount + fee, fee
@@ -0,0 +1,105 @@
+from collections import OrderedDict
+from flask import Flask
+from models.pixkey_model import PixKey
+from models.user_model import User
+from threading import Lock
+import time
+
+_MISSING = object()
+
+class PixKeyResolver:
+    # Cache por processo de chave -> dono. Acertos duram PIX_CACHE_TTL e chaves
+    # inexistentes PIX_NEGATIVE_CACHE_TTL: cadastros feitos em outro processo só
+    # invalidam o cache local, então o prazo negativo deve ser curto.
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._version = 0
+        self._entries: OrderedDict[str, tuple[dict | None, float]] = OrderedDict()
+        self._config = {'PIX_CACHE_SIZE': 0, 'PIX_CACHE_TTL': 0, 'PIX_NEGATIVE_CACHE_TTL': 0}
+
+    def init_app(self, app: Flask) -> None:
+        self._config = app.config
+
+    def _cached(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                return _MISSING
+
+            owner, expires_at = entry
+
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return _MISSING
+
+            self._entries.move_to_end(key)
+            return owner
+
+    def _store(self, key: str, owner: dict | None, version: int) -> None:
+        size = self._config['PIX_CACHE_SIZE']
+        ttl = self._config['PIX_CACHE_TTL'] if owner else self._config['PIX_NEGATIVE_CACHE_TTL']
+
+        if size <= 0 or ttl <= 0:
+            return
+
+        with self._lock:
+            # Um cadastro ocorrido durante a consulta descarta o resultado.
+            if version != self._version:
+                return
+
+            self._entries[key] = (owner, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > size:
+                self._entries.popitem(last=False)
+
+    def resolve(self, session, key: str) -> dict | None:
+        owner = self._cached(key)
+
+        if owner is not _MISSING:
+            return owner
+
+        with self._lock:
+            version = self._version
+
+        row = session.query(User.id, User.username).join(PixKey, PixKey.user_id == User.id).filter(PixKey.key == key).first()
+        owner = {'id': row.id, 'username': row.username} if row else None
+        self._store(key, owner, version)
+        return owner
+
+    def resolve_many(self, session, keys: list[str]) -> dict[str, dict | None]:
+        owners = {key: self._cached(key) for key in set(keys)}
+        missing = [key for key, owner in owners.items() if owner is _MISSING]
+
+        if not missing:
+            return owners
+
+        with self._lock:
+            version = self._version
+
+        rows = session.query(PixKey.key, User.id, User.username).join(User, PixKey.user_id == User.id).filter(PixKey.key.in_(missing))
+        found = {row.key: {'id': row.id, 'username': row.username} for row in rows}
+
+        for key in missing:
+            owners[key] = found.get(key)
+            self._store(key, owners[key], version)
+
+        return owners
+
+    def invalidate(self, *keys: str) -> None:
+        with self._lock:
+            self._version += 1
+
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+
+pixkey_resolver = PixKeyResolver()
+
+def init_pixkey_resolver(app: Flask) -> None:
+    pixkey_resolver.init_app(app)
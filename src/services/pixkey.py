@@ -0,0 +1,130 @@
+from config.pagination import InvalidPageRequest, keyset_page
+from models.pixkey_model import PixKey
+from models.pixkey_types_model import PixKeyType
+from services.pix_resolver import pixkey_resolver
+from services.pixkey_normalization import PixKeyError, normalize_key, normalize_search_key
+from services.reference_cache import pixkey_types_cache
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+
+MAX_BATCH_SIZE = 500
+MAX_KEY_LENGTH = 50
+
+def parse_key_type(value: str | None) -> int | None:
+    if value is None:
+        return None
+
+    try:
+        return int(value)
+    except ValueError:
+        raise InvalidPageRequest('key_type_id')
+
+def list_pixkeys(session, user_id: int, key_type_id: int | None, cursor: str | None, limit: int) -> tuple[list[dict], str | None]:
+    # Uma única consulta por página: a descrição do tipo vem do join.
+    query = session.query(
+        PixKey.id,
+        PixKey.key,
+        PixKey.created_at,
+        PixKeyType.description.label('type')
+    ).outerjoin(PixKeyType, PixKeyType.id == PixKey.key_type_id).filter(PixKey.user_id == user_id)
+
+    if key_type_id is not None:
+        query = query.filter(PixKey.key_type_id == key_type_id)
+
+    rows, next_cursor = keyset_page([query], PixKey.created_at, PixKey.id, cursor, limit)
+    return [{'id': row.id, 'type': row.type, 'key': row.key} for row in rows], next_cursor
+
+def _normalize(key_type: dict | None, key) -> str:
+    if not key_type:
+        raise PixKeyError('Tipo de chave pix não encontrado.', 404)
+
+    if not isinstance(key, str):
+        raise PixKeyError('Chave pix inválida.')
+
+    normalized = normalize_key(key_type['description'], key)
+
+    if not normalized or len(normalized) > MAX_KEY_LENGTH:
+        raise PixKeyError(f'A chave pix deve ter entre 1 e {MAX_KEY_LENGTH} caracteres.')
+
+    return normalized
+
+def add_pixkey(session, user_id: int, key_type_id: int, key: str) -> bool:
+    key = _normalize(pixkey_types_cache.get(key_type_id, session), key)
+    # A unicidade é garantida pelo índice único de `key`, sem consulta prévia.
+    session.add(PixKey(user_id=user_id, key_type_id=key_type_id, key=key))
+
+    try:
+        session.commit()
+    except IntegrityError:
+        session.rollback()
+        return False
+
+    pixkey_resolver.invalidate(key)
+    return True
+
+def _batch_item_error(index: int, code: int, message: str) -> dict:
+    return {'index': index, 'status': 'error', 'code': code, 'message': message}
+
+def _insert_ignore(session):
+    statement = insert(PixKey.__table__)
+
+    if session.get_bind().dialect.name == 'sqlite':
+        return statement.prefix_with('OR IGNORE')
+
+    return statement.prefix_with('IGNORE')
+
+def add_pixkey_batch(session, user_id: int, items: list) -> list[dict]:
+    results = [None] * len(items)
+    pending = {}
+    key_types = pixkey_types_cache.get_many({item['key_type_id'] for item in items if isinstance(item, dict) and isinstance(item.get('key_type_id'), int)}, session)
+
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or not isinstance(item.get('key_type_id'), int):
+            results[index] = _batch_item_error(index, 400, 'Chave pix inválida.')
+            continue
+
+        try:
+            key = _normalize(key_types.get(item['key_type_id']), item.get('key'))
+        except PixKeyError as error:
+            results[index] = _batch_item_error(index, error.code, error.message)
+            continue
+
+        if key in pending:
+            results[index] = _batch_item_error(index, 400, 'Chave pix repetida no lote.')
+        else:
+            pending[key] = (index, item['key_type_id'])
+
+    if pending:
+        # Chaves já cadastradas são conflitos; as demais entram com INSERT IGNORE,
+        # e o índice único decide as disputas com cadastros concorrentes.
+        owners = dict(session.query(PixKey.key, PixKey.user_id).filter(PixKey.key.in_(pending)))
+        new_keys = [key for key in pending if key not in owners]
+
+        if new_keys:
+            inserted = session.execute(_insert_ignore(session), [
+                {'user_id': user_id, 'key_type_id': pending[key][1], 'key': key} for key in new_keys
+            ]).rowcount
+            session.commit()
+            pixkey_resolver.invalidate(*new_keys)
+
+            if inserted != len(new_keys):
+                owners.update(session.query(PixKey.key, PixKey.user_id).filter(
+                    PixKey.key.in_(new_keys),
+                    PixKey.user_id != user_id
+                ))
+
+        for key, (index, _) in pending.items():
+            if key in owners:
+                results[index] = _batch_item_error(index, 404, 'Essa chave pix já foi utilizada.')
+            else:
+                results[index] = {'index': index, 'status': 'success', 'code': 200, 'message': 'Chave pix adicionada com sucesso.'}
+
+    return results
+
+def search_pixkey(session, key: str) -> dict | None:
+    return pixkey_resolver.resolve(session, normalize_search_key(key))
+
+def resolve_pixkey_batch(session, keys: list[str]) -> list[dict]:
+    normalized = [normalize_search_key(key) for key in keys]
+    owners = pixkey_resolver.resolve_many(session, normalized)
+    return [{'pixkey': key, 'user': owners[canonical]} for key, canonical in zip(keys, normalized)]
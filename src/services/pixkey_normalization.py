@@ -0,0 +1,139 @@
+import re
+import unicodedata
+import uuid
+
+EMAIL_PATTERN = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+SEPARATORS = re.compile(r'[\s.\-/()]')
+# Só dígitos ASCII: str.isdigit() também aceita sobrescritos e dígitos de
+# outros alfabetos, que int() recusa ou que gerariam chaves fora do formato.
+DIGITS = re.compile(r'[0-9]+')
+
+class PixKeyError(Exception):
+    def __init__(self, message: str, code: int = 400) -> None:
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+def _digits(value: str) -> str:
+    return SEPARATORS.sub('', value)
+
+def _check_digit(digits: str, weights: list[int]) -> str:
+    remainder = sum(int(digit) * weight for digit, weight in zip(digits, weights)) % 11
+    return '0' if remainder < 2 else str(11 - remainder)
+
+def is_valid_cpf(digits: str) -> bool:
+    if len(digits) != 11 or not DIGITS.fullmatch(digits) or len(set(digits)) == 1:
+        return False
+
+    return (
+        _check_digit(digits[:9], list(range(10, 1, -1))) == digits[9]
+        and _check_digit(digits[:10], list(range(11, 1, -1))) == digits[10]
+    )
+
+def is_valid_cnpj(digits: str) -> bool:
+    if len(digits) != 14 or not DIGITS.fullmatch(digits) or len(set(digits)) == 1:
+        return False
+
+    weights = [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
+    return _check_digit(digits[:12], weights[1:]) == digits[12] and _check_digit(digits[:13], weights) == digits[13]
+
+def normalize_cpf(value: str) -> str:
+    digits = _digits(value)
+
+    if not is_valid_cpf(digits):
+        raise PixKeyError('CPF inválido.')
+
+    return digits
+
+def normalize_cnpj(value: str) -> str:
+    digits = _digits(value)
+
+    if not is_valid_cnpj(digits):
+        raise PixKeyError('CNPJ inválido.')
+
+    return digits
+
+def normalize_phone(value: str) -> str:
+    # E.164; números sem código do país são considerados brasileiros (DDD + número).
+    digits = _digits(value)
+    international = digits.startswith('+')
+    digits = digits.lstrip('+')
+
+    if not DIGITS.fullmatch(digits):
+        raise PixKeyError('Telefone inválido.')
+
+    if not international and len(digits) in (10, 11):
+        digits = f'55{digits}'
+
+    if len(digits) < 8 or len(digits) > 15 or (not international and not digits.startswith('55')):
+        raise PixKeyError('Telefone inválido.')
+
+    return f'+{digits}'
+
+def normalize_email(value: str) -> str:
+    email = value.strip().lower()
+
+    if not EMAIL_PATTERN.match(email):
+        raise PixKeyError('E-mail inválido.')
+
+    return email
+
+def normalize_evp(value: str) -> str:
+    try:
+        evp = uuid.UUID(value.strip())
+    except ValueError:
+        raise PixKeyError('Chave aleatória inválida.')
+
+    if evp.version != 4:
+        raise PixKeyError('Chave aleatória inválida.')
+
+    return str(evp)
+
+NORMALIZERS = {
+    'CPF': normalize_cpf,
+    'CNPJ': normalize_cnpj,
+    'TELEFONE': normalize_phone,
+    'CELULAR': normalize_phone,
+    'PHONE': normalize_phone,
+    'EMAIL': normalize_email,
+    'E-MAIL': normalize_email,
+    'EVP': normalize_evp,
+    'ALEATORIA': normalize_evp,
+    'CHAVE ALEATORIA': normalize_evp
+}
+
+def _type_name(description: str) -> str:
+    decomposed = unicodedata.normalize('NFKD', description.strip().upper())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+def normalize_key(type_description: str | None, key: str) -> str:
+    # Tipos sem regra própria (cadastrados livremente) só perdem os espaços das pontas.
+    normalizer = NORMALIZERS.get(_type_name(type_description or ''))
+    return normalizer(key) if normalizer else key.strip()
+
+def normalize_search_key(key: str) -> str:
+    # A busca não informa o tipo: ele é deduzido do formato. Onze dígitos com
+    # CPF válido são CPF; para buscar um telefone nesse caso, informe o +55.
+    value = key.strip()
+
+    try:
+        if '@' in value:
+            return normalize_email(value)
+
+        if value.startswith('+'):
+            return normalize_phone(value)
+
+        digits = _digits(value)
+
+        if DIGITS.fullmatch(digits):
+            if is_valid_cpf(digits):
+                return digits
+
+            if is_valid_cnpj(digits):
+                return digits
+
+            return normalize_phone(digits)
+
+        return normalize_evp(value)
+    except PixKeyError:
+        return value
@@ -0,0 +1,111 @@
+from config.database import db
+from flask import Flask
+from models.pixkey_types_model import PixKeyType
+from models.transaction_types_model import TransactionTypes
+from threading import Lock
+import hashlib
+import json
+import time
+
+class ReferenceCache:
+    def __init__(self, model, serialize) -> None:
+        self._model = model
+        self._serialize = serialize
+        self._lock = Lock()
+        self._version = 0
+        self._rows: list[dict] | None = None
+        self._by_id: dict[int, dict] = {}
+        self._etag: str | None = None
+        self._loaded_at = 0.0
+        self._missed_at = 0.0
+        self._config = {'REFERENCE_CACHE_TTL': 0, 'REFERENCE_NEGATIVE_CACHE_TTL': 0}
+
+    def init_app(self, app: Flask) -> None:
+        # Guarda a própria config da aplicação: recargas via SIGHUP são vistas sem
+        # depender do contexto do Flask, e o cache também serve a variante assíncrona.
+        self._config = app.config
+
+    def _fetch(self, session, version: int) -> tuple[list[dict], dict[int, dict], str]:
+        session = db.session if session is None else session
+        rows = [self._serialize(row) for row in session.query(self._model).order_by(self._model.id)]
+        by_id = {row['id']: row for row in rows}
+        # O ETag depende apenas do conteúdo, então é o mesmo em todos os processos.
+        etag = hashlib.sha256(json.dumps(rows, sort_keys=True, default=str).encode()).hexdigest()[:32]
+
+        with self._lock:
+            # Uma invalidação ocorrida durante a leitura descarta o resultado.
+            if version == self._version:
+                self._rows, self._by_id, self._etag = rows, by_id, etag
+                self._loaded_at = time.monotonic()
+
+        return rows, by_id, etag
+
+    def _load(self, session=None) -> tuple[list[dict], dict[int, dict], str]:
+        with self._lock:
+            fresh = time.monotonic() - self._loaded_at < self._config['REFERENCE_CACHE_TTL']
+
+            if self._rows is not None and fresh:
+                return self._rows, self._by_id, self._etag
+
+            version = self._version
+
+        return self._fetch(session, version)
+
+    def _reload_missing(self, session) -> dict[int, dict] | None:
+        # Ids desconhecidos podem ter sido criados por outro processo, mas também
+        # podem ser inválidos: recarregam a tabela no máximo uma vez a cada
+        # REFERENCE_NEGATIVE_CACHE_TTL segundos por processo, sem esvaziar o cache.
+        with self._lock:
+            now = time.monotonic()
+
+            if now - max(self._loaded_at, self._missed_at) < self._config['REFERENCE_NEGATIVE_CACHE_TTL']:
+                return None
+
+            self._missed_at = now
+            version = self._version
+
+        return self._fetch(session, version)[1]
+
+    def all(self, session=None) -> list[dict]:
+        return self._load(session)[0]
+
+    def get(self, row_id, session=None) -> dict | None:
+        return self.get_many([row_id], session).get(row_id)
+
+    def get_many(self, row_ids, session=None) -> dict[int, dict]:
+        by_id = self._load(session)[1]
+
+        if any(row_id not in by_id for row_id in row_ids):
+            by_id = self._reload_missing(session) or by_id
+
+        return {row_id: by_id[row_id] for row_id in row_ids if row_id in by_id}
+
+    def etag(self, session=None) -> str:
+        return self._load(session)[2]
+
+    def add(self, session, **values):
+        row = self._model(**values)
+        session.add(row)
+        session.commit()
+        self.invalidate()
+        return row
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._rows = None
+            self._by_id = {}
+            self._etag = None
+
+transaction_types_cache = ReferenceCache(
+    TransactionTypes,
+    lambda tt: {'id': tt.id, 'description': tt.description, 'tax': tt.tax}
+)
+pixkey_types_cache = ReferenceCache(
+    PixKeyType,
+    lambda pkt: {'id': pkt.id, 'description': pkt.description}
+)
+
+def init_reference_caches(app: Flask) -> None:
+    transaction_types_cache.init_app(app)
+    pixkey_types_cache.init_app(app)
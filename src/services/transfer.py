@@ -0,0 +1,229 @@
+from config.database import DEFERRED_COMMIT_INFO_KEY
+from models.user_model import User
+from models.transaction_model import Transaction
+from services.ledger import DEPOSIT_SENDER_ID
+from services.money import ZERO, apply_tax, parse_amount
+from services.reference_cache import transaction_types_cache
+from sqlalchemy import bindparam, insert, update
+from sqlalchemy.exc import OperationalError
+import random
+import time
+
+DEPOSIT_TRANSACTION_TYPE_ID = 1
+MAX_BATCH_SIZE = 10000
+MAX_ATTEMPTS = 3
+RETRY_BACKOFF = 0.05
+# Deadlock e lock wait timeout no MySQL/InnoDB.
+RETRYABLE_MYSQL_ERRORS = (1213, 1205)
+
+class TransferError(Exception):
+    def __init__(self, message: str, code: int) -> None:
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+def _is_retryable(error: OperationalError) -> bool:
+    args = getattr(error.orig, 'args', ())
+
+    if args and args[0] in RETRYABLE_MYSQL_ERRORS:
+        return True
+
+    return 'database is locked' in str(error.orig)
+
+def retry_delay(attempt: int, error: OperationalError) -> float:
+    # Propaga o erro quando não há nova tentativa; senão, devolve a espera.
+    if attempt >= MAX_ATTEMPTS - 1 or not _is_retryable(error):
+        raise error
+
+    return random.uniform(0, RETRY_BACKOFF * 2 ** attempt)
+
+def _with_retry(session, operation, retry: bool):
+    # Com retry=False a operação roda uma única vez: a variante assíncrona
+    # repete fora do run_sync, esperando com asyncio.sleep em vez de bloquear o loop.
+    for attempt in range(MAX_ATTEMPTS):
+        try:
+            result = operation()
+
+            # Com uma chave de idempotência reservada, a operação é confirmada pelo
+            # `idempotent`, na mesma transação que a resposta armazenada.
+            if session.info.get(DEFERRED_COMMIT_INFO_KEY):
+                session.flush()
+            else:
+                session.commit()
+
+            return result
+        except TransferError:
+            session.rollback()
+            raise
+        except OperationalError as error:
+            session.rollback()
+
+            if not retry:
+                raise
+
+            time.sleep(retry_delay(attempt, error))
+
+def _parse_amount(value):
+    amount = parse_amount(value)
+
+    if amount is None:
+        raise TransferError('Valor inválido.', 400)
+
+    return amount
+
+def deposit(session, user_id: int, amount, retry: bool = True) -> Transaction:
+    amount = _parse_amount(amount)
+
+    def operation() -> Transaction:
+        result = session.execute(
+            update(User).where(User.id == user_id).values(balance=User.balance + amount),
+            execution_options={'synchronize_session': False}
+        )
+
+        if result.rowcount == 0:
+            raise TransferError('Usuário não encontrado.', 404)
+
+        new_transaction = Transaction(
+            user_id=DEPOSIT_SENDER_ID,
+            user_dest=user_id,
+            transaction_type_id=DEPOSIT_TRANSACTION_TYPE_ID,
+            amount=amount,
+            description='DEPOSITO'
+        )
+        session.add(new_transaction)
+        return new_transaction
+
+    return _with_retry(session, operation, retry)
+
+def transfer(session, sender_id: int, receiver_id: int, amount, transaction_type_id: int, retry: bool = True) -> Transaction:
+    amount = _parse_amount(amount)
+
+    def operation() -> Transaction:
+        transaction_type = transaction_types_cache.get(transaction_type_id, session)
+
+        if not transaction_type:
+            raise TransferError('Tipo de transação não encontrado.', 404)
+
+        total_amount, fee = apply_tax(amount, transaction_type['tax'])
+
+        # Débito e crédito são UPDATEs condicionais e atômicos, aplicados em ordem
+        # crescente de id: transferências cruzadas adquirem os locks das linhas
+        # sempre na mesma ordem e nenhum saldo é lido e reescrito pelo Python.
+        debit = update(User).where(
+            User.id == sender_id,
+            User.balance >= total_amount
+        ).values(balance=User.balance - total_amount)
+        credit = update(User).where(User.id == receiver_id).values(balance=User.balance + amount)
+        steps = [
+            (sender_id, 0, debit, TransferError('Saldo insuficiente.', 400)),
+            (receiver_id, 1, credit, TransferError('Chave PIX do destinatário não encontrada.', 404))
+        ]
+
+        for _, _, statement, error in sorted(steps, key=lambda step: step[:2]):
+            result = session.execute(statement, execution_options={'synchronize_session': False})
+
+            if result.rowcount == 0:
+                raise error
+
+        new_transaction = Transaction(
+            user_id=sender_id,
+            user_dest=receiver_id,
+            transaction_type_id=transaction_type_id,
+            amount=total_amount,
+            description='TRANSFERENCIA',
+            fee=fee
+        )
+        session.add(new_transaction)
+        return new_transaction
+
+    return _with_retry(session, operation, retry)
+
+def _batch_item_error(index: int, error: TransferError) -> dict:
+    return {'index': index, 'status': 'error', 'code': error.code, 'message': error.message}
+
+def transfer_batch(session, sender_id: int, items: list[dict], retry: bool = True) -> list[dict]:
+    results = [None] * len(items)
+    pending = []
+
+    for index, item in enumerate(items):
+        try:
+            if not isinstance(item, dict):
+                raise TransferError('Transferência inválida.', 400)
+
+            amount = _parse_amount(item.get('amount'))
+
+            if not isinstance(item.get('receiver'), int) or not isinstance(item.get('transaction_type'), int):
+                raise TransferError('Transferência inválida.', 400)
+
+            pending.append((index, item, amount))
+        except TransferError as error:
+            results[index] = _batch_item_error(index, error)
+
+    def operation() -> list[dict]:
+        transaction_types = transaction_types_cache.get_many({item['transaction_type'] for _, item, _ in pending}, session)
+        taxes = {type_id: row['tax'] for type_id, row in transaction_types.items()}
+        receivers = {user_id for user_id, in session.query(User.id).filter(
+            User.id.in_({item['receiver'] for _, item, _ in pending})
+        )}
+        balance = session.query(User.balance).filter_by(id=sender_id).scalar() or ZERO
+        outcome = dict(enumerate(results))
+        credits = {}
+        rows = []
+        total_debit = ZERO
+
+        for index, item, amount in pending:
+            if item['receiver'] not in receivers:
+                outcome[index] = _batch_item_error(index, TransferError('Chave PIX do destinatário não encontrada.', 404))
+                continue
+
+            if item['transaction_type'] not in taxes:
+                outcome[index] = _batch_item_error(index, TransferError('Tipo de transação não encontrado.', 404))
+                continue
+
+            total_amount, fee = apply_tax(amount, taxes[item['transaction_type']])
+
+            if balance - total_debit < total_amount:
+                outcome[index] = _batch_item_error(index, TransferError('Saldo insuficiente.', 400))
+                continue
+
+            total_debit += total_amount
+            credits[item['receiver']] = credits.get(item['receiver'], ZERO) + amount
+            rows.append({
+                'user_id': sender_id,
+                'user_dest': item['receiver'],
+                'transaction_type_id': item['transaction_type'],
+                'amount': total_amount,
+                'fee': fee,
+                'description': 'TRANSFERENCIA'
+            })
+            outcome[index] = {'index': index, 'status': 'success', 'code': 200, 'message': 'Transação realizada com sucesso.'}
+
+        if not rows:
+            return [outcome[index] for index in range(len(items))]
+
+        # Assim como em `transfer`, as linhas são atualizadas em ordem crescente de
+        # id e o débito é condicional, protegendo contra gastos concorrentes.
+        credit = update(User.__table__).where(
+            User.__table__.c.id == bindparam('receiver_id')
+        ).values(balance=User.__table__.c.balance + bindparam('credit'))
+        lower = [{'receiver_id': user_id, 'credit': amount} for user_id, amount in sorted(credits.items()) if user_id < sender_id]
+        upper = [{'receiver_id': user_id, 'credit': amount} for user_id, amount in sorted(credits.items()) if user_id >= sender_id]
+
+        if lower:
+            session.execute(credit, lower)
+
+        debited = session.execute(
+            update(User).where(User.id == sender_id, User.balance >= total_debit).values(balance=User.balance - total_debit),
+            execution_options={'synchronize_session': False}
+        )
+
+        if debited.rowcount == 0:
+            raise TransferError('O saldo foi alterado durante o processamento do lote. Tente novamente.', 409)
+
+        if upper:
+            session.execute(credit, upper)
+
+        session.execute(insert(Transaction), rows)
+        return [outcome[index] for index in range(len(items))]
+
+    return _with_retry(session, operation, retry)